@@ -0,0 +1,177 @@
+"""
+metatime command line: stream losses through a RelationalClock.
+
+    python -m metatime losses.txt
+    cat losses.f32 | python -m metatime --in-format f32 --out-format binary > states.bin
+    python -m metatime big.f64 --in-format f64 --summary
+
+Input is processed in blocks of --block-size values via RelationalClock.tick_many()
+(--summary skips provably STAGNANT runs with core.coalesce.tick_coalesced()).
+Binary output is one packed little-endian record per step: uint8 state code
+(0 STAGNANT, 1 LIVING, 2 AWAKENING), float64 age, float64 density.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+from collections import Counter
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .core.clock import STATE_CODES, ClockConfig, RelationalClock
+from .core.coalesce import tick_coalesced
+
+RECORD_DTYPE = np.dtype([("state", "u1"), ("age", "<f8"), ("density", "<f8")])
+IN_DTYPES = {"f32": "<f4", "f64": "<f8"}
+
+
+def _text_blocks(stream: BinaryIO, block_size: int) -> Iterator[List[float]]:
+    lines = io.TextIOWrapper(stream, encoding="utf-8")
+    lineno = 0  # lines consumed before this chunk
+    while True:
+        chunk = list(islice(lines, block_size))
+        if not chunk:
+            return
+        try:
+            values = [float(x) for x in chunk if x.strip()]
+        except ValueError:
+            # slow path, only to name the offending line
+            for i, x in enumerate(chunk, lineno + 1):
+                if x.strip():
+                    try:
+                        float(x)
+                    except ValueError:
+                        raise ValueError(f"line {i}: not a number: {x.strip()!r}") from None
+            raise
+        lineno += len(chunk)
+        yield values
+
+
+def _binary_blocks(stream: BinaryIO, block_size: int, dtype: str) -> Iterator[np.ndarray]:
+    itemsize = np.dtype(dtype).itemsize
+    want = block_size * itemsize
+    pending = b""
+    while True:
+        data = stream.read(want - len(pending))
+        if not data:
+            break
+        pending += data
+        if len(pending) < want:
+            continue
+        yield np.frombuffer(pending, dtype=dtype)
+        pending = b""
+    usable = len(pending) - len(pending) % itemsize
+    if usable != len(pending):
+        raise ValueError(f"input ends with a partial {dtype} value ({len(pending) % itemsize} stray bytes)")
+    if usable:
+        yield np.frombuffer(pending, dtype=dtype)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="metatime", description="Run a loss stream through the relational clock.")
+    p.add_argument("input", nargs="?", default="-", help="input file ('-' = stdin)")
+    p.add_argument("-o", "--output", default="-", help="output file ('-' = stdout)")
+    p.add_argument("--in-format", choices=("text", "f32", "f64"), default="text",
+                   help="one float per line, or raw little-endian float32/float64")
+    p.add_argument("--out-format", choices=("csv", "binary"), default="csv")
+    p.add_argument("--summary", action="store_true", help="print only aggregates (JSON), no per-step output")
+    p.add_argument("--block-size", type=int, default=1 << 16)
+
+    d = ClockConfig()
+    g = p.add_argument_group("clock")
+    g.add_argument("--base-threshold", type=float, default=d.base_threshold)
+    g.add_argument("--awakening-multiplier", type=float, default=d.awakening_multiplier)
+    g.add_argument("--living-multiplier", type=float, default=d.living_multiplier)
+    g.add_argument("--awakening-age-gain", type=float, default=d.awakening_age_gain)
+    g.add_argument("--no-weighted-delta", action="store_true")
+    g.add_argument("--epsilon", type=float, default=d.epsilon)
+    return p
+
+
+def config_from_args(args: argparse.Namespace) -> ClockConfig:
+    return ClockConfig(
+        base_threshold=args.base_threshold,
+        awakening_multiplier=args.awakening_multiplier,
+        living_multiplier=args.living_multiplier,
+        awakening_age_gain=args.awakening_age_gain,
+        use_weighted_delta=not args.no_weighted_delta,
+        epsilon=args.epsilon,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.block_size <= 0:
+        parser.error("--block-size must be > 0")
+    clock = RelationalClock(config_from_args(args))
+
+    src: BinaryIO = sys.stdin.buffer
+    dst: BinaryIO = sys.stdout.buffer
+    try:
+        if args.input != "-":
+            src = open(args.input, "rb", buffering=1 << 20)
+        if args.output != "-":
+            dst = open(args.output, "wb", buffering=1 << 20)
+    except OSError as exc:
+        if src is not sys.stdin.buffer:
+            src.close()
+        parser.error(f"can't open '{exc.filename}': {exc.strerror}")
+    if args.in_format == "text":
+        blocks = _text_blocks(src, args.block_size)
+    else:
+        blocks = _binary_blocks(src, args.block_size, IN_DTYPES[args.in_format])
+
+    counts: Counter = Counter()
+    try:
+        if args.out_format == "csv" and not args.summary:
+            dst.write(b"step,state,age,density\n")
+        for block in blocks:
+            if args.summary:
+                counts.update(tick_coalesced(clock, block))
+                continue
+            first = clock.step_counter + 1
+            ages: List[float] = []
+            densities: List[float] = []
+            states = clock.tick_many(block, ages, densities)
+            counts.update(states)
+            if args.out_format == "binary":
+                rec = np.empty(len(states), dtype=RECORD_DTYPE)
+                rec["state"] = [STATE_CODES[s] for s in states]
+                rec["age"] = ages
+                rec["density"] = densities
+                dst.write(rec.tobytes())
+            else:
+                lines = [
+                    f"{first + i},{s.value},{a!r},{d!r}\n"
+                    for i, (s, a, d) in enumerate(zip(states, ages, densities))
+                ]
+                dst.write("".join(lines).encode("ascii"))
+
+        if args.summary:
+            summary = {
+                "steps": clock.step_counter,
+                "age": clock.relational_age,
+                "density": clock.density,
+                "coherence": clock.coherence,
+                "counts": {s.value: counts.get(s, 0) for s in STATE_CODES},
+            }
+            dst.write((json.dumps(summary) + "\n").encode("utf-8"))
+        dst.flush()
+    except BrokenPipeError:
+        # downstream closed early (e.g. `| head`); not an error for a filter
+        return 0
+    except ValueError as exc:
+        # malformed input: a non-numeric text line or a truncated binary value
+        print(f"metatime: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        if src is not sys.stdin.buffer:
+            src.close()
+        if dst is not sys.stdout.buffer:
+            dst.close()
+    return 0
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+from .clock import RelationalClock, TemporalState
+
+
+class RollingAnalytics:
+    """
+    Rolling metrics over the last N ticks of a RelationalClock, for several N at once.
+
+    One ring buffer (sized for the largest window) holds per-step age, density and
+    an awakening flag; each window keeps running sums that are updated with the
+    value entering and the value leaving it. Every update and every read is O(1).
+
+    Metrics per window:
+      - awakening_rate(w): fraction of the last w steps that were AWAKENING
+      - mean_density(w)  : mean clock.density over the last w steps
+      - age_velocity(w)  : relational age gained per step over the last w steps
+    And steps_since_awakening() for the whole run.
+    """
+
+    def __init__(self, clock: RelationalClock, windows: Sequence[int] = (100, 1000)):
+        if not windows or min(windows) <= 0:
+            raise ValueError("windows must be a non-empty list of positive ints")
+        self.clock = clock
+        self.windows: List[int] = sorted(set(int(w) for w in windows))
+
+        self._size = self.windows[-1] + 1
+        self._ages: List[float] = [0.0] * self._size
+        self._density: List[float] = [0.0] * self._size
+        self._awake: List[int] = [0] * self._size
+
+        self._awake_count: Dict[int, int] = {w: 0 for w in self.windows}
+        self._density_sum: Dict[int, float] = {w: 0.0 for w in self.windows}
+
+        self.steps: int = 0
+        self._age0: float = clock.relational_age
+        self._last_awakening: Optional[int] = None
+
+    def tick(self, loss_value: float) -> TemporalState:
+        state = self.clock.tick(loss_value)
+        self.record(state)
+        return state
+
+    def record(self, state: TemporalState) -> None:
+        """Fold in the clock's current step (call right after clock.tick())."""
+        t = self.steps
+        i = t % self._size
+        awake = 1 if state == TemporalState.AWAKENING else 0
+        density = self.clock.density
+
+        self._ages[i] = self.clock.relational_age
+        self._density[i] = density
+        self._awake[i] = awake
+
+        for w in self.windows:
+            self._awake_count[w] += awake
+            self._density_sum[w] += density
+            if t >= w:
+                j = (t - w) % self._size
+                self._awake_count[w] -= self._awake[j]
+                self._density_sum[w] -= self._density[j]
+
+        if awake:
+            self._last_awakening = t
+        self.steps = t + 1
+
+        # add/subtract drifts over millions of steps; resum once per ring pass (amortized O(1))
+        if self.steps % self._size == 0:
+            self._resum()
+
+    def _resum(self) -> None:
+        t = self.steps
+        for w in self.windows:
+            n = min(w, t)
+            idx = [(t - 1 - k) % self._size for k in range(n)]
+            self._density_sum[w] = math.fsum(self._density[j] for j in idx)
+
+    def _check(self, window: int) -> int:
+        if window not in self._awake_count:
+            raise KeyError(f"window {window} not tracked; available: {self.windows}")
+        return min(window, self.steps)
+
+    def awakening_rate(self, window: int) -> float:
+        n = self._check(window)
+        return self._awake_count[window] / n if n else 0.0
+
+    def mean_density(self, window: int) -> float:
+        n = self._check(window)
+        return self._density_sum[window] / n if n else 0.0
+
+    def age_velocity(self, window: int) -> float:
+        n = self._check(window)
+        if n == 0:
+            return 0.0
+        t = self.steps
+        age_now = self._ages[(t - 1) % self._size]
+        age_then = self._ages[(t - 1 - n) % self._size] if t > n else self._age0
+        return (age_now - age_then) / n
+
+    def steps_since_awakening(self) -> Optional[int]:
+        """Ticks since the last AWAKENING (0 = this step), None if none seen yet."""
+        if self._last_awakening is None:
+            return None
+        return self.steps - 1 - self._last_awakening
+
+    def snapshot(self) -> Dict[str, float]:
+        """All metrics as a flat dict, e.g. for logging."""
+        out: Dict[str, float] = {}
+        for w in self.windows:
+            out[f"awakening_rate@{w}"] = self.awakening_rate(w)
+            out[f"mean_density@{w}"] = self.mean_density(w)
+            out[f"age_velocity@{w}"] = self.age_velocity(w)
+        since = self.steps_since_awakening()
+        out["steps_since_awakening"] = float("nan") if since is None else float(since)
+        return out
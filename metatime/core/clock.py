@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 import math
 
 
@@ -13,6 +13,19 @@ class TemporalState(str, Enum):
     AWAKENING = "AWAKENING"
 
 
+# Compact integer codes for binary / shared-memory layouts
+STATE_CODES: Dict[TemporalState, int] = {
+    TemporalState.STAGNANT: 0,
+    TemporalState.LIVING: 1,
+    TemporalState.AWAKENING: 2,
+}
+CODE_STATES: Dict[int, TemporalState] = {v: k for k, v in STATE_CODES.items()}
+
+# Smoothing of the delta EMA behind the dynamic threshold
+# (small => stable; bigger => reactive). Shared by tick(), tick_many() and core.coalesce.
+EMA_ALPHA = 0.12
+
+
 @dataclass
 class ClockConfig:
     # Threshold base for "meaningful change" (prediction error change)
@@ -63,6 +76,67 @@ class RelationalClock:
         self.prev_coherence: float = 1.0
         self.density: float = 0.0
 
+        # Transition hooks: fn(prev_state, state, step, age), called on state changes
+        self.last_state: Optional[TemporalState] = None
+        self._transition_listeners: List[Callable[..., None]] = []
+        self.events = None  # TransitionBus, created by subscribe()
+
+    def add_transition_listener(self, fn: Callable[..., None]) -> None:
+        """
+        Low-level hook run inline by tick() whenever the state changes.
+        Keep it cheap; use subscribe() for handlers that do real work.
+        """
+        self._transition_listeners.append(fn)
+
+    def remove_transition_listener(self, fn: Callable[..., None]) -> None:
+        self._transition_listeners.remove(fn)
+
+    def subscribe(self, handler: Callable, from_state=None, to_state=None, batch: bool = False):
+        """
+        Run `handler` on state transitions without blocking tick(): events are
+        queued and dispatched on a thread pool by this clock's TransitionBus.
+        See metatime.core.events. Returns the Subscription.
+        """
+        if self.events is None:
+            from .events import TransitionBus
+            self.events = TransitionBus()
+            self.events.attach(self)
+            self.events.start()
+        return self.events.subscribe(handler, from_state=from_state, to_state=to_state, batch=batch)
+
+    def _transition(self, state: TemporalState) -> TemporalState:
+        prev = self.last_state
+        self.last_state = state
+        if state is not prev and self._transition_listeners:
+            for fn in self._transition_listeners:
+                fn(prev, state, self.step_counter, self.relational_age)
+        return state
+
+    def state_dict(self) -> Dict[str, Any]:
+        """
+        Everything tick() depends on or updates (config excluded).
+        Loading it into a clock with the same config resumes the run exactly.
+        """
+        return {
+            "step_counter": self.step_counter,
+            "relational_age": self.relational_age,
+            "prev_loss": self._prev_loss,
+            "ema_delta": self._ema_delta,
+            "coherence": self.coherence,
+            "prev_coherence": self.prev_coherence,
+            "density": self.density,
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        self.step_counter = int(state["step_counter"])
+        self.relational_age = float(state["relational_age"])
+        prev = state["prev_loss"]
+        self._prev_loss = None if prev is None else float(prev)
+        self._ema_delta = float(state["ema_delta"])
+        self.coherence = float(state["coherence"])
+        self.prev_coherence = float(state["prev_coherence"])
+        self.density = float(state["density"])
+
     def get_dynamic_threshold(self) -> float:
         """
         Dynamic threshold = base + small term from running delta (optional).
@@ -84,14 +158,13 @@ class RelationalClock:
             self.prev_coherence = self.coherence
             self.coherence = 1.0
             self.density = 0.0
-            return TemporalState.LIVING
+            return self._transition(TemporalState.LIVING)
 
         loss_value = float(loss_value)
         raw_delta = abs(loss_value - self._prev_loss)
 
         # EMA of delta (for smoothing)
-        # alpha is small => stable; bigger => reactive
-        alpha = 0.12
+        alpha = EMA_ALPHA
         self._ema_delta = (1 - alpha) * self._ema_delta + alpha * raw_delta
 
         threshold = self.get_dynamic_threshold()
@@ -126,7 +199,107 @@ class RelationalClock:
 
         self.relational_age += float(age_gain)
         self._prev_loss = loss_value
-        return state
+        return self._transition(state)
+
+    def tick_many(
+        self,
+        losses: Iterable[float],
+        ages: Optional[List[float]] = None,
+        densities: Optional[List[float]] = None,
+    ) -> List[TemporalState]:
+        """
+        Batch path: same arithmetic as calling tick() once per value,
+        with attribute lookups hoisted out of the loop.
+        Accepts any iterable of floats, including NumPy arrays / memmap views.
+        If given, `ages` / `densities` get relational_age / density appended after every step.
+        """
+        if hasattr(losses, "tolist"):
+            losses = losses.tolist()
+
+        cfg = self.cfg
+        base = cfg.base_threshold
+        eps = cfg.epsilon
+        weighted = cfg.use_weighted_delta
+        exp = math.exp
+        alpha = EMA_ALPHA
+        STAGNANT, LIVING, AWAKENING = TemporalState.STAGNANT, TemporalState.LIVING, TemporalState.AWAKENING
+
+        prev_loss = self._prev_loss
+        ema = self._ema_delta
+        age = self.relational_age
+        coherence = self.coherence
+        prev_coherence = self.prev_coherence
+        density = self.density
+        steps = 0
+
+        listeners = self._transition_listeners
+        if listeners and ages is None:
+            ages = []  # transitions are reported with the age at their step
+        track = ages is not None or densities is not None
+        if track:
+            ages = ages if ages is not None else []
+            densities = densities if densities is not None else []
+
+        states: List[TemporalState] = []
+        append = states.append
+        for loss_value in losses:
+            steps += 1
+            loss_value = float(loss_value)
+            if prev_loss is None:
+                prev_loss = loss_value
+                prev_coherence = coherence
+                coherence = 1.0
+                density = 0.0
+                append(LIVING)
+                if track:
+                    ages.append(age)
+                    densities.append(density)
+                continue
+
+            raw_delta = abs(loss_value - prev_loss)
+            ema = (1 - alpha) * ema + alpha * raw_delta
+            threshold = base + 0.25 * ema
+            prev_coherence = coherence
+            coherence = 1.0 / (1.0 + raw_delta + eps)
+            density = raw_delta
+
+            if raw_delta <= threshold:
+                append(STAGNANT)
+            else:
+                if raw_delta >= 3.0 * threshold:
+                    append(AWAKENING)
+                    age_gain = cfg.awakening_age_gain + cfg.awakening_multiplier * (raw_delta - threshold)
+                else:
+                    append(LIVING)
+                    age_gain = cfg.living_multiplier * (raw_delta - threshold)
+                if weighted and age_gain > 0.0:
+                    age_gain *= 1.0 / (1.0 + exp(-10.0 * (raw_delta - threshold)))
+                age += float(age_gain)
+            prev_loss = loss_value
+            if track:
+                ages.append(age)
+                densities.append(density)
+
+        self.step_counter += steps
+        self.relational_age = age
+        self._prev_loss = prev_loss
+        self._ema_delta = ema
+        self.coherence = coherence
+        self.prev_coherence = prev_coherence
+        self.density = density
+
+        if states:
+            prev = self.last_state
+            self.last_state = states[-1]
+            if listeners:
+                first_step = self.step_counter - len(states) + 1
+                age_offset = len(ages) - len(states)
+                for i, state in enumerate(states):
+                    if state is not prev:
+                        for fn in listeners:
+                            fn(prev, state, first_step + i, ages[age_offset + i])
+                    prev = state
+        return states
 
     def tick_result(self, loss_value: float) -> TickResult:
         """
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .clock import EMA_ALPHA, RelationalClock, TemporalState
+
+
+def tick_coalesced(
+    clock: RelationalClock,
+    losses: Sequence[float],
+    min_run: int = 16,
+    exact: bool = True,
+    min_coalesced: float = 0.5,
+) -> List[TemporalState]:
+    """
+    Same result as clock.tick_many(losses), with provably STAGNANT runs
+    applied without the full per-step tick.
+
+    A step whose |delta| <= base_threshold is always STAGNANT (the dynamic
+    threshold is base_threshold + 0.25 * ema with ema >= 0) and changes nothing
+    but the EMA, the step count and the last-step metrics. Runs of at least
+    `min_run` such steps are found with NumPy; everything else goes through
+    tick_many(). If less than `min_coalesced` of the block would be skipped,
+    the whole block goes through tick_many().
+
+    exact=True advances the EMA with the same scalar recurrence tick() uses, so
+    ages, states and all clock internals stay bit-identical. exact=False uses the
+    closed form ema * d^k + alpha * sum(d^(k-1-j) * delta_j), which is cheaper
+    but differs in the last bits and can therefore flip a later near-threshold
+    decision.
+    """
+    x = np.asarray(losses, dtype=np.float64).ravel()
+    states: List[TemporalState] = []
+    if len(x) == 0:
+        return states
+
+    start = 0
+    if clock._prev_loss is None:
+        states.extend(clock.tick_many(x[:1]))
+        start = 1
+        deltas = np.abs(np.diff(x))  # deltas[i] belongs to sample x[start + i]
+    else:
+        deltas = np.abs(np.diff(np.concatenate(([clock._prev_loss], x))))
+
+    safe = deltas <= clock.cfg.base_threshold
+    # run boundaries of `safe`: [lo, hi) index pairs into deltas
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], safe, [False])).astype(np.int8)))
+    bounds = edges.reshape(-1, 2)
+    bounds = bounds[bounds[:, 1] - bounds[:, 0] >= min_run]
+    if int((bounds[:, 1] - bounds[:, 0]).sum()) < min_coalesced * len(deltas):
+        bounds = bounds[:0]  # too little to skip; one tick_many beats many small calls
+
+    pos = 0  # next index into deltas (x[start + pos] is its sample)
+    for lo, hi in bounds.tolist():
+        if lo > pos:
+            states.extend(clock.tick_many(x[start + pos:start + lo]))
+        _apply_stagnant(clock, deltas[lo:hi], float(x[start + hi - 1]), exact)
+        states.extend([TemporalState.STAGNANT] * (hi - lo))
+        pos = hi
+    if pos < len(deltas):
+        states.extend(clock.tick_many(x[start + pos:]))
+    return states
+
+
+def _apply_stagnant(clock: RelationalClock, deltas: np.ndarray, last_loss: float, exact: bool) -> None:
+    """Advance `clock` over len(deltas) steps known to be STAGNANT."""
+    alpha = EMA_ALPHA
+    k = len(deltas)
+    ema = clock._ema_delta
+    if exact:
+        for d in deltas.tolist():
+            ema = (1 - alpha) * ema + alpha * d
+    else:
+        decay = (1 - alpha) ** np.arange(k - 1, -1, -1, dtype=np.float64)
+        ema = float((1 - alpha) ** k * ema + alpha * np.dot(decay, deltas))
+
+    eps = clock.cfg.epsilon
+    first_step = clock.step_counter + 1
+    clock.step_counter += k
+    clock._ema_delta = ema
+    clock._prev_loss = last_loss
+    clock.prev_coherence = 1.0 / (1.0 + float(deltas[-2]) + eps) if k > 1 else clock.coherence
+    clock.coherence = 1.0 / (1.0 + float(deltas[-1]) + eps)
+    clock.density = float(deltas[-1])
+
+    prev = clock.last_state
+    clock.last_state = TemporalState.STAGNANT
+    if prev is not TemporalState.STAGNANT:
+        for fn in clock._transition_listeners:
+            fn(prev, TemporalState.STAGNANT, first_step, clock.relational_age)
+
+
+class CoalescingIngestor:
+    """
+    Push-style front end for high-rate feeds: samples are buffered and applied
+    with tick_coalesced() every `block_size` values (and on flush()).
+    Each applied block's states go to `on_states` if given; `counts` totals them.
+
+        ing = CoalescingIngestor(clock)
+        for x in feed:
+            ing.push(x)
+        ing.flush()
+        ing.counts[TemporalState.AWAKENING]
+    """
+
+    def __init__(
+        self,
+        clock: RelationalClock,
+        block_size: int = 1 << 14,
+        min_run: int = 16,
+        exact: bool = True,
+        on_states: Optional[Callable[[List[TemporalState]], None]] = None,
+    ):
+        if block_size <= 0:
+            raise ValueError("block_size must be > 0")
+        self.clock = clock
+        self.block_size = block_size
+        self.min_run = min_run
+        self.exact = exact
+        self.on_states = on_states
+        self.counts: Dict[TemporalState, int] = {s: 0 for s in TemporalState}
+        self._buf: List[float] = []
+
+    def push(self, value: float) -> None:
+        self._buf.append(value)
+        if len(self._buf) >= self.block_size:
+            self.flush()
+
+    def extend(self, values: Sequence[float]) -> None:
+        self.flush()
+        self._apply(values)
+
+    def flush(self) -> None:
+        if self._buf:
+            buf, self._buf = self._buf, []
+            self._apply(buf)
+
+    def _apply(self, values: Sequence[float]) -> None:
+        states = tick_coalesced(self.clock, values, self.min_run, self.exact)
+        for state in self.counts:
+            self.counts[state] += states.count(state)
+        if self.on_states is not None and states:
+            self.on_states(states)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, List, Optional
+
+from .clock import RelationalClock, TemporalState
+
+
+@dataclass(frozen=True)
+class TransitionEvent:
+    from_state: Optional[TemporalState]  # None on the very first tick
+    to_state: TemporalState
+    step: int
+    age: float
+
+
+@dataclass
+class Subscription:
+    handler: Callable
+    from_state: Optional[TemporalState] = None  # None = any
+    to_state: Optional[TemporalState] = None
+    batch: bool = False  # handler(list_of_events) instead of handler(event)
+    pending: Deque[TransitionEvent] = field(default_factory=deque)
+    running: bool = False
+    active: bool = True
+
+    def matches(self, ev: TransitionEvent) -> bool:
+        return (self.from_state is None or ev.from_state == self.from_state) and (
+            self.to_state is None or ev.to_state == self.to_state
+        )
+
+
+class TransitionBus:
+    """
+    Asynchronous dispatch of clock state transitions.
+
+    The producer side (tick) only appends to a deque, which is atomic in CPython
+    and needs no lock, so a slow handler can never add latency to tick(). A
+    dispatcher thread drains the queue every `poll_interval` seconds, in batches
+    of up to `batch_size`, and hands each subscription its matching events on a
+    thread pool. Each subscription runs one batch at a time, so its handler sees
+    events in order. Coroutine handlers run on `loop` (asyncio) instead.
+
+        bus = TransitionBus()
+        bus.attach(clock)
+        bus.subscribe(save_checkpoint, to_state=TemporalState.AWAKENING)
+        with bus:
+            train()
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        batch_size: int = 256,
+        poll_interval: float = 0.001,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        on_error: Optional[Callable[[BaseException, Subscription], Any]] = None,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.loop = loop
+        self.on_error = on_error
+
+        self._queue: Deque[TransitionEvent] = deque()
+        self._subs: List[Subscription] = []
+        self._lock = threading.Lock()  # dispatcher + pool only: pops, pending, running, _inflight, stats
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metatime-events")
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._inflight = 0  # batches popped but not fully handled (dispatcher + drain tasks)
+
+        self.published = 0
+        self.delivered = 0
+        self.errors = 0
+
+    # ---------------------------------------------------------------- producer
+
+    def publish(self, event: TransitionEvent) -> None:
+        self._queue.append(event)
+        self.published += 1
+
+    def _on_transition(self, prev, state, step, age) -> None:
+        self._queue.append(TransitionEvent(prev, state, step, age))
+        self.published += 1
+
+    def attach(self, clock: RelationalClock) -> None:
+        """Publish every state change of `clock` on this bus."""
+        clock.add_transition_listener(self._on_transition)
+
+    def detach(self, clock: RelationalClock) -> None:
+        clock.remove_transition_listener(self._on_transition)
+
+    # ----------------------------------------------------------- subscriptions
+
+    def subscribe(
+        self,
+        handler: Callable,
+        from_state: Optional[TemporalState] = None,
+        to_state: Optional[TemporalState] = None,
+        batch: bool = False,
+    ) -> Subscription:
+        if asyncio.iscoroutinefunction(handler) and self.loop is None:
+            raise ValueError("coroutine handlers need TransitionBus(loop=...)")
+        sub = Subscription(handler, from_state, to_state, batch)
+        with self._lock:
+            self._subs = self._subs + [sub]  # copy-on-write: dispatcher iterates without locking
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            sub.active = False
+            self._subs = [s for s in self._subs if s is not sub]
+
+    # -------------------------------------------------------------- dispatcher
+
+    def start(self) -> "TransitionBus":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metatime-dispatch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        if drain:
+            self.flush(timeout)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._pool.shutdown(wait=drain)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything published so far has been handled. False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._thread is None:
+                self._dispatch_once()
+            with self._lock:
+                idle = not self._queue and self._inflight == 0
+            if idle:
+                return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def __enter__(self) -> "TransitionBus":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self._dispatch_once():
+                time.sleep(self.poll_interval)
+
+    def _dispatch_once(self) -> bool:
+        q = self._queue
+        if not q:
+            return False
+        with self._lock:
+            # pop and count as in flight atomically, so flush() never sees
+            # "queue empty, nothing in flight" while events sit in this batch
+            popleft = q.popleft
+            events = [popleft() for _ in range(min(len(q), self.batch_size))]
+            self._inflight += 1
+        try:
+            for sub in self._subs:
+                matched = [ev for ev in events if sub.matches(ev)]
+                if not matched:
+                    continue
+                with self._lock:
+                    if not sub.active:
+                        continue
+                    sub.pending.extend(matched)
+                    if sub.running:
+                        continue
+                    sub.running = True
+                    self._inflight += 1
+                self._pool.submit(self._drain, sub)
+        finally:
+            with self._lock:
+                self._inflight -= 1
+        return True
+
+    def _drain(self, sub: Subscription) -> None:
+        finished = False
+        try:
+            while True:
+                with self._lock:
+                    if not sub.pending or not sub.active:
+                        sub.pending.clear()
+                        sub.running = False
+                        self._inflight -= 1
+                        finished = True
+                        return
+                    n = min(len(sub.pending), self.batch_size)
+                    batch = [sub.pending.popleft() for _ in range(n)]
+                try:
+                    self._call(sub, batch)
+                except BaseException as exc:  # a failing handler must not kill dispatch
+                    with self._lock:
+                        self.errors += 1
+                    if self.on_error is not None:
+                        try:
+                            self.on_error(exc, sub)
+                        except BaseException:  # nor a failing error hook
+                            with self._lock:
+                                self.errors += 1
+                with self._lock:
+                    self.delivered += len(batch)
+        finally:
+            if not finished:
+                # unexpected exit: release the subscription so flush() and later
+                # dispatches are not stuck behind it
+                with self._lock:
+                    sub.running = False
+                    self._inflight -= 1
+
+    def _call(self, sub: Subscription, batch: List[TransitionEvent]) -> None:
+        h = sub.handler
+        if asyncio.iscoroutinefunction(h):
+            calls = [h(batch)] if sub.batch else [h(ev) for ev in batch]
+            for coro in calls:
+                asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+        elif sub.batch:
+            h(batch)
+        else:
+            for ev in batch:
+                h(ev)
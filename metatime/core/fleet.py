@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from collections import deque
+from numbers import Integral
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .clock import STATE_CODES, TemporalState
+
+AWAKENING_CODE = STATE_CODES[TemporalState.AWAKENING]
+
+
+@dataclass(frozen=True)
+class SyncEvent:
+    step: int
+    count: int          # streams with an AWAKENING within the window
+    fraction: float     # count / fleet size
+    streams: np.ndarray  # their indices, ascending
+
+
+class FleetSyncDetector:
+    """
+    Detects synchronized AWAKENINGs across a fleet of per-stream clocks.
+
+    For the last `window` steps it keeps one packed bitset per step (bit i set =
+    stream i awakened) plus, per stream, how many of those steps it awakened in.
+    A step adds the new bitset and expires the oldest one. Counter updates touch
+    only the streams involved, and finding the expired ones scans streams / 8
+    bytes, so update_indices() costs about O(awakenings) plus a short memchr-like
+    pass. `count` (streams that awakened within the window) is maintained
+    incrementally.
+
+    Memory is fixed: window * streams / 8 bytes of bitsets plus one small
+    counter per stream (about 0.9 MB for 100k streams and window=64), and the
+    last `history` (step, count) pairs in `events`.
+
+    When count reaches `threshold` (an int number of streams, or a float
+    fraction of the fleet in (0, 1); floats >= 1 are rejected as ambiguous) a
+    SyncEvent is returned and passed to `on_event`; it fires again only after
+    count has dropped back below the threshold. The detector does not keep the
+    events' stream arrays.
+
+        det = FleetSyncDetector(streams=100_000, window=8, threshold=0.02)
+        for codes in per_step_state_codes:     # uint8 (streams,), STATE_CODES
+            event = det.update(codes)
+            if event is not None:
+                ...
+    """
+
+    def __init__(
+        self,
+        streams: int,
+        window: int = 8,
+        threshold: Union[int, float] = 0.05,
+        on_event: Optional[Callable[[SyncEvent], None]] = None,
+        history: int = 1024,
+    ):
+        if streams <= 0 or window <= 0:
+            raise ValueError("need streams > 0 and window > 0")
+        self.streams = streams
+        self.window = window
+        if isinstance(threshold, Integral) and not isinstance(threshold, bool):
+            if threshold < 1:
+                raise ValueError("an int threshold is a stream count and must be >= 1")
+            self.min_count = int(threshold)
+        else:
+            if not 0 < threshold < 1:
+                raise ValueError(
+                    f"a float threshold is a fraction of the fleet and must be in (0, 1), got {threshold!r}; "
+                    "pass an int for a stream count"
+                )
+            self.min_count = max(1, int(np.ceil(threshold * streams)))
+        self.on_event = on_event
+
+        self._bits = np.zeros((window, (streams + 7) // 8), dtype=np.uint8)
+        self._slot_counts = np.zeros(window, dtype=np.int64)  # awakenings stored per slot
+        count_dtype = np.uint8 if window < 256 else np.uint16 if window < 65536 else np.uint32
+        self._counts = np.zeros(streams, dtype=count_dtype)
+
+        self.step = 0
+        self.count = 0
+        self._armed = True
+        self.events: Deque[Tuple[int, int]] = deque(maxlen=history)  # (step, count)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bits.nbytes + self._counts.nbytes + self._slot_counts.nbytes
+
+    def update(self, codes: np.ndarray) -> Optional[SyncEvent]:
+        """One step for the whole fleet from a (streams,) array of state codes."""
+        codes = np.asarray(codes)
+        if codes.shape != (self.streams,):
+            raise ValueError(f"expected shape ({self.streams},), got {codes.shape}")
+        return self.update_indices(np.flatnonzero(codes == AWAKENING_CODE))
+
+    def update_indices(self, awakened: Sequence[int]) -> Optional[SyncEvent]:
+        """One step from the indices of the streams that AWAKENED (no duplicates)."""
+        idx = np.asarray(awakened, dtype=np.int64)
+        slot = self.step % self.window
+        row = self._bits[slot]
+        counts = self._counts
+
+        if self._slot_counts[slot]:
+            old = _bit_indices(row)
+            counts[old] -= 1
+            self.count -= int(np.count_nonzero(counts[old] == 0))
+            row[:] = 0
+
+        if len(idx):
+            counts[idx] += 1
+            self.count += int(np.count_nonzero(counts[idx] == 1))
+            np.bitwise_or.at(row, idx >> 3, (0x80 >> (idx & 7)).astype(np.uint8))
+        self._slot_counts[slot] = len(idx)
+        self.step += 1
+
+        if self.count < self.min_count:
+            self._armed = True
+            return None
+        if not self._armed:
+            return None
+        self._armed = False
+        event = SyncEvent(self.step, self.count, self.count / self.streams, self.awakened())
+        self.events.append((event.step, event.count))
+        if self.on_event is not None:
+            self.on_event(event)
+        return event
+
+    def awakened(self) -> np.ndarray:
+        """Indices of the streams that awakened within the window."""
+        return np.flatnonzero(self._counts)
+
+    def awakened_at(self, steps_ago: int = 0) -> np.ndarray:
+        """Indices of the streams that awakened `steps_ago` steps back (0 = last step)."""
+        if not 0 <= steps_ago < min(self.window, self.step):
+            raise IndexError(f"steps_ago must be in [0, {min(self.window, self.step)})")
+        slot = (self.step - 1 - steps_ago) % self.window
+        return _bit_indices(self._bits[slot])
+
+
+def _bit_indices(row: np.ndarray) -> np.ndarray:
+    """Set bit positions of a packed (big-endian bit order) bitset, ascending."""
+    nz = np.flatnonzero(row)
+    r, c = np.nonzero(np.unpackbits(row[nz]).reshape(-1, 8))
+    return nz[r] * 8 + c
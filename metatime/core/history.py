@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, List, Optional
+
+from .clock import RelationalClock, TemporalState
+
+METRICS = ("age", "coherence", "density")
+STATES = (TemporalState.STAGNANT, TemporalState.LIVING, TemporalState.AWAKENING)
+
+# bucket layout (flat doubles): n | per metric: min, max, sum, last | per state: count
+_N = 0
+_M0 = 1
+_S0 = _M0 + 4 * len(METRICS)
+_WIDTH = _S0 + len(STATES)
+_STATE_COL = {s: _S0 + i for i, s in enumerate(STATES)}
+
+
+def _empty_bucket() -> List[float]:
+    b = [0.0] * _WIDTH
+    for m in range(len(METRICS)):
+        b[_M0 + 4 * m] = float("inf")
+        b[_M0 + 4 * m + 1] = float("-inf")
+    return b
+
+
+class MultiResolutionHistory:
+    """
+    Round-robin, multi-resolution trajectory of relational_age / coherence / density.
+
+    Level 0 keeps the last `capacity` steps at full resolution. Level k keeps the
+    last `capacity` buckets of factor**k steps, each with min/max/mean/last per
+    metric and per-state counts. Buckets are aligned to step numbers, so a range
+    query is pure index arithmetic.
+
+    Memory is fixed: (levels + 1) * capacity buckets, whatever the run length.
+    Updates cascade (a level-k bucket is folded into level k+1 only when it
+    closes), so a tick costs O(1) amortized.
+    """
+
+    def __init__(self, clock: RelationalClock, capacity: int = 4096, factor: int = 8, levels: int = 6):
+        if capacity <= 0 or factor < 2 or levels < 0:
+            raise ValueError("need capacity > 0, factor >= 2, levels >= 0")
+        self.clock = clock
+        self.capacity = capacity
+        self.factor = factor
+        self.sizes: List[int] = [factor ** k for k in range(levels + 1)]
+
+        self._rings: List[array] = [array("d", bytes(8 * _WIDTH * capacity)) for _ in self.sizes]
+        self._closed: List[int] = [0] * len(self.sizes)  # closed buckets per level (= next ordinal)
+        self._open: List[List[float]] = [_empty_bucket() for _ in self.sizes]
+        self._origin: Optional[int] = None  # step of the first record
+
+    # ------------------------------------------------------------------ ingest
+
+    def tick(self, loss_value: float) -> TemporalState:
+        state = self.clock.tick(loss_value)
+        self.record(state)
+        return state
+
+    def record(self, state: TemporalState) -> None:
+        """Fold in the clock's current step (call right after clock.tick())."""
+        if self._origin is None:
+            self._origin = self.clock.step_counter
+        b = [0.0] * _WIDTH
+        b[_N] = 1.0
+        for m, v in enumerate((self.clock.relational_age, self.clock.coherence, self.clock.density)):
+            o = _M0 + 4 * m
+            b[o] = b[o + 1] = b[o + 2] = b[o + 3] = float(v)
+        b[_STATE_COL[state]] = 1.0
+        self._close(0, b)
+
+    def _close(self, level: int, bucket: List[float]) -> None:
+        slot = (self._closed[level] % self.capacity) * _WIDTH
+        self._rings[level][slot: slot + _WIDTH] = array("d", bucket)
+        self._closed[level] += 1
+
+        up = level + 1
+        if up == len(self.sizes):
+            return
+        acc = self._open[up]
+        _merge_into(acc, bucket)
+        if acc[_N] >= self.sizes[up]:
+            self._open[up] = _empty_bucket()
+            self._close(up, acc)
+
+    # ------------------------------------------------------------------- query
+
+    @property
+    def steps(self) -> int:
+        return self._closed[0]
+
+    def first_retained_step(self, level: int) -> Optional[int]:
+        if self._origin is None:
+            return None
+        oldest = max(0, self._closed[level] - self.capacity)
+        return self._origin + oldest * self.sizes[level]
+
+    def pick_level(self, start: int, stop: int, points: int = 1000) -> int:
+        """Finest level that still holds `start` and needs at most `points` buckets."""
+        if self._origin is not None:
+            # only recorded steps count: a..b may start before the first record
+            start = max(start, self._origin)
+            stop = min(stop, self._origin + self._closed[0] - 1)
+        span = max(1, stop - start + 1)
+        for k, size in enumerate(self.sizes):
+            first = self.first_retained_step(k)
+            if first is not None and first <= start and -(-span // size) <= points:
+                return k
+        return len(self.sizes) - 1
+
+    def query(self, start: int, stop: int, points: int = 1000, level: Optional[int] = None) -> Dict[str, List[float]]:
+        """
+        Return ~`points` buckets covering steps start..stop (inclusive) at the
+        right resolution, as columns: step, count, <metric>_min/_max/_mean/_last,
+        and one count column per state. Steps no longer retained are skipped;
+        the still-open bucket at the chosen level is included.
+        """
+        out: Dict[str, List[float]] = {"step": [], "count": []}
+        for m in METRICS:
+            for suffix in ("min", "max", "mean", "last"):
+                out[f"{m}_{suffix}"] = []
+        for s in STATES:
+            out[s.value] = []
+        if self._origin is None or stop < start:
+            return out
+
+        k = self.pick_level(start, stop, points) if level is None else level
+        size = self.sizes[k]
+        ring = self._rings[k]
+        closed = self._closed[k]
+
+        lo = max((start - self._origin) // size, closed - self.capacity, 0)
+        hi = min((stop - self._origin) // size, closed)  # ordinal `closed` is the open bucket
+        for j in range(lo, hi + 1):
+            if j < closed:
+                slot = (j % self.capacity) * _WIDTH
+                b = ring[slot: slot + _WIDTH]
+            else:
+                b = self._partial(k)
+                if b[_N] == 0:
+                    break
+            n = b[_N]
+            out["step"].append(self._origin + j * size)
+            out["count"].append(n)
+            for m, name in enumerate(METRICS):
+                o = _M0 + 4 * m
+                out[f"{name}_min"].append(b[o])
+                out[f"{name}_max"].append(b[o + 1])
+                out[f"{name}_mean"].append(b[o + 2] / n)
+                out[f"{name}_last"].append(b[o + 3])
+            for s in STATES:
+                out[s.value].append(b[_STATE_COL[s]])
+        return out
+
+    def _partial(self, level: int) -> List[float]:
+        # open bucket at `level` plus the not-yet-cascaded steps held open below it
+        b = _empty_bucket()
+        for k in range(level, 0, -1):
+            _merge_into(b, self._open[k])
+        return b
+
+
+def _merge_into(acc: List[float], b: List[float]) -> None:
+    if b[_N] == 0:
+        return
+    acc[_N] += b[_N]
+    for m in range(len(METRICS)):
+        o = _M0 + 4 * m
+        if b[o] < acc[o]:
+            acc[o] = b[o]
+        if b[o + 1] > acc[o + 1]:
+            acc[o + 1] = b[o + 1]
+        acc[o + 2] += b[o + 2]
+        acc[o + 3] = b[o + 3]
+    for c in range(_S0, _WIDTH):
+        acc[c] += b[c]
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+from .clock import CODE_STATES, STATE_CODES, ClockConfig, RelationalClock, TemporalState
+
+# Layout: one float64 array.
+#   header  [seq, step, age, prev_loss, ema_delta, coherence, prev_coherence, density, state, world_size]
+#   slots   world_size x [step_tag, loss]
+# Header fields are published under a seqlock: the reducer makes `seq` odd while
+# writing and even when done; readers retry until they see the same even seq
+# before and after reading. A worker publishes a loss by writing it first and its
+# step tag second, so the reducer never sees a tag without its value.
+_SEQ, _STEP, _AGE, _PREV, _EMA, _COH, _PCOH, _DENS, _STATE, _WORLD = range(10)
+_HEADER = 10
+_SLOT = 2
+
+
+@dataclass
+class SharedClockState:
+    step: int
+    age: float
+    state: Optional[TemporalState]
+    density: float
+    coherence: float
+
+
+class SharedClock:
+    """
+    RelationalClock whose published state lives in multiprocessing.shared_memory,
+    for data-parallel training with one clock per job instead of one per worker.
+
+    - every rank: submit(rank, loss) once per step (two float stores, no pickling)
+    - one reducer: reduce() waits for all ranks, ticks the global clock on the
+      mean loss and publishes the result
+    - any rank: read() / age / state, lock-free (seqlock retry)
+
+    Create in the parent with SharedClock.create(...) and pass `name` (a string)
+    to workers, which call SharedClock.attach(name, cfg).
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, cfg: ClockConfig, owner: bool):
+        self.cfg = cfg
+        self._shm = shm
+        self._owner = owner
+        self._buf = shm.buf.cast("d")
+        self.world_size = int(self._buf[_WORLD])
+        self._clock: Optional[RelationalClock] = None  # reducer-side only, built lazily
+        self._next_step: Optional[int] = None
+
+    @classmethod
+    def create(cls, world_size: int, cfg: Optional[ClockConfig] = None, name: Optional[str] = None) -> "SharedClock":
+        if world_size <= 0:
+            raise ValueError("world_size must be > 0")
+        size = 8 * (_HEADER + _SLOT * world_size)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        buf = shm.buf.cast("d")
+        for i in range(len(buf)):
+            buf[i] = 0.0
+        buf[_PREV] = math.nan
+        buf[_COH] = 1.0
+        buf[_PCOH] = 1.0
+        buf[_STATE] = -1.0
+        buf[_WORLD] = float(world_size)
+        buf.release()
+        return cls(shm, cfg or ClockConfig(), owner=True)
+
+    @classmethod
+    def attach(cls, name: str, cfg: Optional[ClockConfig] = None) -> "SharedClock":
+        return cls(shared_memory.SharedMemory(name=name), cfg or ClockConfig(), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    # ----------------------------------------------------------------- workers
+
+    def submit(self, rank: int, loss_value: float, step: Optional[int] = None, poll: float = 1e-5) -> None:
+        """
+        Publish this rank's loss for `step` (default: one past this handle's last
+        submit). If the reducer has not consumed the previous step yet, wait for
+        it, so a fast rank never overwrites a loss that was not reduced.
+        """
+        if not 0 <= rank < self.world_size:
+            raise IndexError(f"rank {rank} out of range for world_size {self.world_size}")
+        if step is None:
+            step = self._next_step if self._next_step is not None else self.read().step + 1
+        self._next_step = step + 1
+
+        buf = self._buf
+        while buf[_STEP] < step - 1:
+            time.sleep(poll)
+        o = _HEADER + _SLOT * rank
+        buf[o + 1] = float(loss_value)
+        buf[o] = float(step)
+
+    # ----------------------------------------------------------------- reducer
+
+    def reduce(self, timeout: Optional[float] = None, poll: float = 1e-5) -> TemporalState:
+        """
+        Wait until every rank submitted a loss for the next step, tick the global
+        clock once on their mean and publish the new state. Only one process may
+        call this.
+        """
+        buf = self._buf
+        if self._clock is None:
+            self._clock = RelationalClock(self.cfg)
+            self._clock.load_state_dict(self._load_header())
+        target = float(self._clock.step_counter + 1)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        slots = range(_HEADER, _HEADER + _SLOT * self.world_size, _SLOT)
+        while True:
+            if all(buf[o] >= target for o in slots):
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                missing = [(o - _HEADER) // _SLOT for o in slots if buf[o] < target]
+                raise TimeoutError(f"step {int(target)}: no loss from ranks {missing}")
+            time.sleep(poll)
+
+        loss = math.fsum(buf[o + 1] for o in slots) / self.world_size
+        state = self._clock.tick(loss)
+        self._publish(state)
+        return state
+
+    def _publish(self, state: TemporalState) -> None:
+        buf, clock = self._buf, self._clock
+        seq = buf[_SEQ] + 1.0
+        buf[_SEQ] = seq  # odd: write in progress
+        buf[_STEP] = float(clock.step_counter)
+        buf[_AGE] = clock.relational_age
+        buf[_PREV] = math.nan if clock._prev_loss is None else clock._prev_loss
+        buf[_EMA] = clock._ema_delta
+        buf[_COH] = clock.coherence
+        buf[_PCOH] = clock.prev_coherence
+        buf[_DENS] = clock.density
+        buf[_STATE] = float(STATE_CODES[state])
+        buf[_SEQ] = seq + 1.0
+
+    # ----------------------------------------------------------------- readers
+
+    def _snapshot(self) -> List[float]:
+        buf = self._buf
+        while True:
+            s1 = buf[_SEQ]
+            if s1 % 2.0 == 0.0:
+                fields = buf[_SEQ:_WORLD].tolist()
+                if buf[_SEQ] == s1:
+                    return fields
+            time.sleep(0)
+
+    def _load_header(self) -> dict:
+        h = self._snapshot()
+        return {
+            "step_counter": int(h[_STEP]),
+            "relational_age": h[_AGE],
+            "prev_loss": None if math.isnan(h[_PREV]) else h[_PREV],
+            "ema_delta": h[_EMA],
+            "coherence": h[_COH],
+            "prev_coherence": h[_PCOH],
+            "density": h[_DENS],
+        }
+
+    def read(self) -> SharedClockState:
+        h = self._snapshot()
+        code = int(h[_STATE])
+        return SharedClockState(
+            step=int(h[_STEP]),
+            age=h[_AGE],
+            state=CODE_STATES.get(code),
+            density=h[_DENS],
+            coherence=h[_COH],
+        )
+
+    @property
+    def age(self) -> float:
+        return self.read().age
+
+    @property
+    def state(self) -> Optional[TemporalState]:
+        return self.read().state
+
+    # --------------------------------------------------------------- lifecycle
+
+    def close(self) -> None:
+        self._buf.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "SharedClock":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from .clock import ClockConfig, RelationalClock, TemporalState
+
+
+def _same_bits(a: Optional[float], b: Optional[float]) -> bool:
+    """Bit-for-bit float equality, so a NaN carried across a boundary (e.g. an empty CSV cell) still matches."""
+    if a is None or b is None:
+        return a is b
+    return struct.pack("<d", a) == struct.pack("<d", b)
+
+
+@dataclass
+class ClockSummary:
+    """
+    Compact result of replaying one contiguous segment of a loss stream.
+
+    Carry-in / carry-out hold the clock internals at the segment boundaries
+    (`_prev_loss`, `_ema_delta`), so two summaries can only be merged when the
+    second one started exactly where the first one ended. merge() is
+    associative; merging all segments of a split replay gives the same counts,
+    awakening steps and end state as a single replay, and the same age up to
+    floating-point summation order.
+    """
+    start_step: int                     # clock.step_counter before the segment
+    steps: int = 0
+    age: float = 0.0                    # relational age gained inside the segment
+    counts: Dict[str, int] = field(default_factory=lambda: {s.value: 0 for s in TemporalState})
+    awakenings: List[int] = field(default_factory=list)  # absolute steps of AWAKENING ticks
+
+    prev_loss_in: Optional[float] = None
+    ema_in: float = 0.0
+    prev_loss_out: Optional[float] = None
+    ema_out: float = 0.0
+
+    # clock metrics after the last tick of the segment
+    coherence: float = 1.0
+    prev_coherence: float = 1.0
+    density: float = 0.0
+
+    @property
+    def end_step(self) -> int:
+        return self.start_step + self.steps
+
+    def end_state(self, start_age: float = 0.0) -> Dict[str, Any]:
+        """Clock state_dict() after the segment (relative to `start_age`)."""
+        return {
+            "step_counter": self.end_step,
+            "relational_age": start_age + self.age,
+            "prev_loss": self.prev_loss_out,
+            "ema_delta": self.ema_out,
+            "coherence": self.coherence,
+            "prev_coherence": self.prev_coherence,
+            "density": self.density,
+        }
+
+    def continues(self, other: "ClockSummary") -> bool:
+        """True if `other` was replayed from exactly the state this one ended in."""
+        return (
+            other.start_step == self.end_step
+            and _same_bits(other.prev_loss_in, self.prev_loss_out)
+            and _same_bits(other.ema_in, self.ema_out)
+        )
+
+    def merge(self, other: "ClockSummary") -> "ClockSummary":
+        if not self.continues(other):
+            raise ValueError(
+                f"segments are not continuous: [{self.start_step}, {self.end_step}) "
+                f"then start={other.start_step} (prev_loss/ema carry-over must match)"
+            )
+        return ClockSummary(
+            start_step=self.start_step,
+            steps=self.steps + other.steps,
+            age=self.age + other.age,
+            counts={k: self.counts.get(k, 0) + other.counts.get(k, 0) for k in {*self.counts, *other.counts}},
+            awakenings=self.awakenings + other.awakenings,
+            prev_loss_in=self.prev_loss_in,
+            ema_in=self.ema_in,
+            prev_loss_out=other.prev_loss_out,
+            ema_out=other.ema_out,
+            coherence=other.coherence,
+            prev_coherence=other.prev_coherence,
+            density=other.density,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ClockSummary":
+        return cls(**d)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, s: str) -> "ClockSummary":
+        return cls.from_dict(json.loads(s))
+
+
+def summarize(
+    losses: Sequence[float],
+    cfg: Optional[ClockConfig] = None,
+    start_state: Optional[Dict[str, Any]] = None,
+) -> ClockSummary:
+    """
+    Replay `losses` from `start_state` (a RelationalClock.state_dict(); fresh
+    clock if None) and summarize the segment.
+    """
+    clock = RelationalClock(cfg or ClockConfig())
+    if start_state is not None:
+        clock.load_state_dict(start_state)
+    start_age = clock.relational_age
+    summary = ClockSummary(
+        start_step=clock.step_counter,
+        prev_loss_in=clock._prev_loss,
+        ema_in=clock._ema_delta,
+    )
+
+    states = clock.tick_many(losses)
+    counts = summary.counts
+    for i, state in enumerate(states):
+        counts[state.value] += 1
+        if state is TemporalState.AWAKENING:
+            summary.awakenings.append(summary.start_step + i + 1)
+
+    summary.steps = len(states)
+    summary.age = clock.relational_age - start_age
+    summary.prev_loss_out = clock._prev_loss
+    summary.ema_out = clock._ema_delta
+    summary.coherence = clock.coherence
+    summary.prev_coherence = clock.prev_coherence
+    summary.density = clock.density
+    return summary
+
+
+def merge_all(summaries: Sequence[ClockSummary]) -> ClockSummary:
+    if not summaries:
+        raise ValueError("nothing to merge")
+    out = summaries[0]
+    for s in summaries[1:]:
+        out = out.merge(s)
+    return out
+
+
+def _speculative_start(losses: Sequence[float], start: int, warmup: int, cfg: ClockConfig) -> Dict[str, Any]:
+    # prev_loss at a chunk boundary is just losses[start-1]; the EMA is estimated
+    # by replaying the `warmup` losses before it (its error shrinks by 0.88 per step)
+    clock = RelationalClock(cfg)
+    clock.tick_many(losses[max(0, start - warmup - 1): start])
+    state = clock.state_dict()
+    state["step_counter"] = start
+    state["relational_age"] = 0.0
+    return state
+
+
+def _summarize_chunk(args: tuple) -> ClockSummary:
+    losses, cfg, start_state = args
+    return summarize(losses, cfg, start_state)
+
+
+def parallel_replay(
+    losses: Sequence[float],
+    cfg: Optional[ClockConfig] = None,
+    chunks: Optional[int] = None,
+    processes: Optional[int] = None,
+    warmup: int = 512,
+) -> ClockSummary:
+    """
+    Replay one long trace in parallel by chunking it across processes.
+
+    Each chunk starts from a speculative boundary state (exact prev_loss, EMA
+    warmed up over `warmup` preceding losses). While merging in order, a chunk
+    whose carry-in does not match its predecessor's carry-out bit for bit is
+    replayed again from the true state, so the result matches a single
+    sequential replay: same counts, awakening steps and end state, and the same
+    age up to floating-point summation order (see ClockSummary).
+    """
+    cfg = cfg or ClockConfig()
+    n = len(losses)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    chunks = max(1, min(chunks or processes, n))
+    bounds = [n * i // chunks for i in range(chunks + 1)]
+
+    jobs = []
+    for i in range(chunks):
+        a, b = bounds[i], bounds[i + 1]
+        start_state = None if a == 0 else _speculative_start(losses, a, warmup, cfg)
+        jobs.append((losses[a:b], cfg, start_state))
+
+    if processes > 1 and chunks > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            parts = list(pool.map(_summarize_chunk, jobs))
+    else:
+        parts = [_summarize_chunk(j) for j in jobs]
+
+    out = parts[0]
+    for job, part in zip(jobs[1:], parts[1:]):
+        if not out.continues(part):
+            part = summarize(job[0], cfg, out.end_state())
+        out = out.merge(part)
+    return out
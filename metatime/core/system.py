@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
+from .analytics import RollingAnalytics
 from .clock import RelationalClock, ClockConfig, TemporalState
 
 
@@ -12,16 +13,27 @@ class MetaTimeSystem:
     Minimal system wrapper:
     - Holds a relational clock
     - Exposes observe()/tick() bridge for demos
+    - Optionally keeps rolling analytics (set analytics_windows)
     """
     clock_cfg: ClockConfig = field(default_factory=ClockConfig)
+    analytics_windows: Tuple[int, ...] = ()
     clock: RelationalClock = field(init=False)
+    analytics: Optional[RollingAnalytics] = field(init=False, default=None)
 
     def __post_init__(self) -> None:
         self.clock = RelationalClock(self.clock_cfg)
+        if self.analytics_windows:
+            self.analytics = RollingAnalytics(self.clock, self.analytics_windows)
 
     def tick(self, loss_value: float) -> TemporalState:
+        if self.analytics is not None:
+            return self.analytics.tick(loss_value)
         return self.clock.tick(loss_value)
 
+    def subscribe(self, handler, from_state=None, to_state=None, batch: bool = False):
+        """Non-blocking transition handler; see RelationalClock.subscribe."""
+        return self.clock.subscribe(handler, from_state=from_state, to_state=to_state, batch=batch)
+
     def observe(self, loss_value: float) -> TemporalState:
         # backward compatible alias (old demos used observe)
         return self.tick(loss_value)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+
+class PredictorEnsemble:
+    """
+    Several online predictors run side by side over many channels, vectorized
+    with NumPy. Each channel follows whichever predictor has had the lowest
+    running (EWMA) absolute error so far. Prediction error is what the clock
+    sees, so a poor predictor shows up as spurious AWAKENINGs.
+
+    Predictors, in row order of predict_all():
+      - EWMA at each alpha in `ewma_alphas` (same rule as EWMA_Predictor)
+      - last value
+      - linear trend (Holt: level + trend)
+      - AR(ar_order) with bias, fitted by recursive least squares
+
+    Every update costs O(1) per channel (O(ar_order^2) for the RLS step).
+
+        ens = PredictorEnsemble(channels=1000)
+        for x in stream:             # x: shape (1000,)
+            err = np.abs(x - ens.predict())
+            ens.update(x)
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        ewma_alphas: Sequence[float] = (0.05, 0.15, 0.5),
+        ar_order: int = 2,
+        rls_lambda: float = 0.99,
+        rls_delta: float = 100.0,
+        rls_max_trace: float = 1e6,
+        trend_alpha: float = 0.5,
+        trend_beta: float = 0.1,
+        error_alpha: float = 0.05,
+    ):
+        if channels <= 0:
+            raise ValueError("channels must be > 0")
+        if ar_order < 0:
+            raise ValueError("ar_order must be >= 0")
+        C = channels
+        self.channels = C
+        self.alphas = np.asarray(ewma_alphas, dtype=np.float64).reshape(-1, 1)
+        self.ar_order = ar_order
+        self.rls_lambda = rls_lambda
+        self.rls_delta = rls_delta
+        self.rls_max_trace = rls_max_trace
+        self.trend_alpha = trend_alpha
+        self.trend_beta = trend_beta
+        self.error_alpha = error_alpha
+
+        self.names: List[str] = [f"ewma({a:g})" for a in ewma_alphas] + ["last", "trend", f"ar({ar_order})"]
+        self.steps = 0
+
+        self._mu = np.zeros((len(ewma_alphas), C))
+        self._last = np.zeros(C)
+        self._level = np.zeros(C)
+        self._trend = np.zeros(C)
+
+        d = ar_order + 1  # lags + bias
+        self._hist = np.zeros((C, ar_order))
+        self._w = np.zeros((C, d))
+        self._P = np.tile(np.eye(d) * rls_delta, (C, 1, 1))
+
+        self._preds = np.zeros((len(self.names), C))
+        self.running_error = np.zeros((len(self.names), C))
+        self._rows = np.arange(C)
+
+    def _phi(self) -> np.ndarray:
+        return np.concatenate([self._hist, np.ones((self.channels, 1))], axis=1)
+
+    def _refresh(self) -> None:
+        k = len(self.alphas)
+        p = self._preds
+        p[:k] = self._mu
+        p[k] = self._last
+        p[k + 1] = self._level + self._trend
+        p[k + 2] = np.einsum("cd,cd->c", self._w, self._phi())
+
+    def predict_all(self) -> np.ndarray:
+        """(n_predictors, channels) current predictions; zeros before the first update."""
+        return self._preds
+
+    def best(self) -> np.ndarray:
+        """Index of the selected predictor per channel (see `names`); non-finite errors never win."""
+        err = self.running_error
+        if not np.isfinite(err).all():
+            err = np.where(np.isfinite(err), err, np.inf)
+        return np.argmin(err, axis=0)
+
+    def predict(self) -> np.ndarray:
+        """(channels,) prediction of the currently best predictor of each channel."""
+        return self._preds[self.best(), self._rows]
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=np.float64).reshape(self.channels)
+
+        if self.steps == 0:
+            self._mu[:] = x
+            self._last[:] = x
+            self._level[:] = x
+            self._hist[:] = x[:, None]
+            self.steps = 1
+            self._refresh()
+            return
+
+        # score the predictions made for this step, then learn from it
+        err = np.abs(x - self._preds)
+        ea = self.error_alpha
+        self.running_error *= 1.0 - ea
+        self.running_error += ea * err
+
+        self._mu = (1 - self.alphas) * self._mu + self.alphas * x  # as EWMA_Predictor.update
+        self._last[:] = x
+
+        a, b = self.trend_alpha, self.trend_beta
+        prev_level = self._level
+        level = a * x + (1.0 - a) * (prev_level + self._trend)
+        self._trend = b * (level - prev_level) + (1.0 - b) * self._trend
+        self._level = level
+
+        # RLS: k = P phi / (lam + phi' P phi); w += k e; P = (P - k phi' P) / lam
+        phi = self._phi()
+        Pphi = np.einsum("cij,cj->ci", self._P, phi)
+        denom = self.rls_lambda + np.einsum("ci,ci->c", phi, Pphi)
+        k = Pphi / denom[:, None]
+        e = x - np.einsum("cd,cd->c", self._w, phi)
+        self._w += k * e[:, None]
+        self._P -= np.einsum("ci,cj->cij", k, Pphi)
+        self._P /= self.rls_lambda
+        # With flat input, forgetting inflates P by 1/lambda per step in the
+        # unexcited directions until it overflows or loses positive
+        # definiteness; restart those channels.
+        diag = np.einsum("cii->ci", self._P)
+        blown = ~((diag >= 0.0).all(axis=1) & (diag.sum(axis=1) <= self.rls_max_trace))  # also catches NaN
+        if blown.any():
+            self._P[blown] = np.eye(self._P.shape[1]) * self.rls_delta
+            self._w[blown & ~np.isfinite(self._w).all(axis=1)] = 0.0
+
+        if self.ar_order:
+            self._hist[:, 1:] = self._hist[:, :-1]
+            self._hist[:, 0] = x
+
+        self.steps += 1
+        self._refresh()
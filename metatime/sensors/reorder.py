@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import heapq
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from ..core.clock import RelationalClock, TemporalState
+
+LATE_POLICIES = ("drop", "tick", "raise", "side")
+
+
+class LateEventError(ValueError):
+    """Raised by ReorderBuffer(late_policy="raise") for an event behind the released stream."""
+
+
+@dataclass
+class ReorderStats:
+    received: int = 0
+    released: int = 0
+    late: int = 0          # arrived behind the last released timestamp
+    forced: int = 0        # released early because the buffer hit capacity
+    buffered: int = 0
+    max_buffered: int = 0
+    memory_bytes: int = 0  # approximate size of the heap and its entries
+    latency_sum: float = 0.0  # seconds from push() to release, over released events
+    latency_max: float = 0.0
+
+    @property
+    def latency_mean(self) -> float:
+        return self.latency_sum / self.released if self.released else 0.0
+
+
+# one heap entry: (timestamp, value, arrival seq, arrival time); tuple of 4 + 3 floats + int
+_ENTRY_BYTES = sys.getsizeof((0.0, 0.0, 0, 0.0)) + 3 * sys.getsizeof(0.0) + sys.getsizeof(1 << 40)
+
+
+class ReorderBuffer:
+    """
+    Turns timestamped, out-of-order readings into the in-order loss stream
+    RelationalClock expects.
+
+    Events wait in a binary heap (O(log n) insert) until the watermark,
+    max timestamp seen - allowed_lateness, passes them; they are then fed to
+    clock.tick_many() in timestamp order (ties in arrival order). An event older
+    than the last released timestamp is late and handled by `late_policy`:
+
+      - "drop":  count it and discard it
+      - "tick":  feed it to the clock right away, out of order
+      - "raise": LateEventError
+      - "side":  hand (timestamp, value) to `on_late`
+
+    At most `capacity` events are buffered; beyond that the oldest is released
+    early (counted as `forced`), so memory stays bounded under a stalled source.
+
+        buf = ReorderBuffer(clock, allowed_lateness=2.0)
+        for ts, loss in feed:
+            for state in buf.push(ts, loss):
+                ...
+        buf.flush()
+    """
+
+    def __init__(
+        self,
+        clock: RelationalClock,
+        allowed_lateness: float = 0.0,
+        capacity: int = 1 << 16,
+        late_policy: str = "drop",
+        on_late: Optional[Callable[[float, float], None]] = None,
+        on_release: Optional[Callable[[List[float], List[TemporalState]], None]] = None,
+    ):
+        if allowed_lateness < 0 or capacity <= 0:
+            raise ValueError("need allowed_lateness >= 0 and capacity > 0")
+        if late_policy not in LATE_POLICIES:
+            raise ValueError(f"late_policy must be one of {LATE_POLICIES}")
+        if late_policy == "side" and on_late is None:
+            raise ValueError('late_policy="side" needs on_late')
+        self.clock = clock
+        self.allowed_lateness = allowed_lateness
+        self.capacity = capacity
+        self.late_policy = late_policy
+        self.on_late = on_late
+        self.on_release = on_release
+
+        self._heap: List[Tuple[float, float, int, float]] = []
+        self._seq = 0
+        self.max_timestamp = float("-inf")
+        self.released_timestamp = float("-inf")  # timestamp of the last released event
+        self._stats = ReorderStats()
+
+    @property
+    def watermark(self) -> float:
+        return self.max_timestamp - self.allowed_lateness
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    # ------------------------------------------------------------------ ingest
+
+    def push(self, timestamp: float, value: float) -> List[TemporalState]:
+        """Add one reading; returns the states of the events it released (often none)."""
+        out: List[TemporalState] = []
+        if self._admit(timestamp, value, time.perf_counter(), out):
+            self._release(self.max_timestamp - self.allowed_lateness, out)
+        return out
+
+    def push_many(self, timestamps: Sequence[float], values: Sequence[float]) -> List[TemporalState]:
+        """
+        Add a batch of readings, then release once. Lateness is judged against
+        what was released before the batch, so the batch acts as one arrival.
+        """
+        if hasattr(timestamps, "tolist"):
+            timestamps = timestamps.tolist()
+        if hasattr(values, "tolist"):
+            values = values.tolist()
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values differ in length")
+        out: List[TemporalState] = []
+        now = time.perf_counter()
+        admit = self._admit
+        for ts, v in zip(timestamps, values):
+            admit(ts, v, now, out)
+        self._release(self.max_timestamp - self.allowed_lateness, out)
+        return out
+
+    def flush(self) -> List[TemporalState]:
+        """Release everything still buffered (end of stream)."""
+        out: List[TemporalState] = []
+        self._release(float("inf"), out)
+        return out
+
+    def _admit(self, timestamp: float, value: float, now: float, out: List[TemporalState]) -> bool:
+        st = self._stats
+        st.received += 1
+        if timestamp < self.released_timestamp:
+            st.late += 1
+            policy = self.late_policy
+            if policy == "raise":
+                raise LateEventError(
+                    f"event at {timestamp} is behind released timestamp {self.released_timestamp}"
+                )
+            if policy == "tick":
+                out.append(self.clock.tick(value))
+            elif policy == "side":
+                self.on_late(timestamp, value)
+            return False
+
+        heapq.heappush(self._heap, (timestamp, value, self._seq, now))
+        self._seq += 1
+        if timestamp > self.max_timestamp:
+            self.max_timestamp = timestamp
+        n = len(self._heap)
+        if n > st.max_buffered:
+            st.max_buffered = n
+        if n > self.capacity:
+            st.forced += 1
+            self._release(self._heap[0][0], out, limit=n - self.capacity)
+        return True
+
+    def _release(self, upto: float, out: List[TemporalState], limit: Optional[int] = None) -> None:
+        heap = self._heap
+        if not heap or heap[0][0] > upto:
+            return
+        pop = heapq.heappop
+        timestamps: List[float] = []
+        values: List[float] = []
+        lat_sum = 0.0
+        lat_max = self._stats.latency_max
+        now = time.perf_counter()
+        while heap and heap[0][0] <= upto and (limit is None or len(values) < limit):
+            ts, v, _, arrived = pop(heap)
+            timestamps.append(ts)
+            values.append(v)
+            lat = now - arrived
+            lat_sum += lat
+            if lat > lat_max:
+                lat_max = lat
+
+        st = self._stats
+        st.released += len(values)
+        st.latency_sum += lat_sum
+        st.latency_max = lat_max
+        self.released_timestamp = timestamps[-1]
+        states = self.clock.tick_many(values)
+        if self.on_release is not None:
+            self.on_release(timestamps, states)
+        out.extend(states)
+
+    # ------------------------------------------------------------------- stats
+
+    def stats(self) -> ReorderStats:
+        st = self._stats
+        n = len(self._heap)
+        return ReorderStats(
+            received=st.received,
+            released=st.released,
+            late=st.late,
+            forced=st.forced,
+            buffered=n,
+            max_buffered=st.max_buffered,
+            memory_bytes=sys.getsizeof(self._heap) + n * _ENTRY_BYTES,
+            latency_sum=st.latency_sum,
+            latency_max=st.latency_max,
+        )
@@ -0,0 +1,213 @@
+"""
+Declarative, vectorized synthetic traces for load-testing the clock.
+
+A Scenario is a base level plus a list of regimes applied in order to a
+(streams, steps) float array. Every regime parameter is either a scalar (same
+for all streams) or a (low, high) pair, sampled uniformly per stream, so one
+call produces thousands of different but reproducible streams:
+
+    sc = Scenario([Periodic(period=63.0, amplitude=1.0),
+                   Shift(at=120, offset=(0.5, 1.0), scale=1.8),
+                   Noise(std=0.05)])
+    x = sc.generate(steps=1_000_000, streams=1_000, seed=7, dtype=np.float32)
+
+For traces too large for memory, iter_blocks() yields consecutive time blocks.
+Random regimes draw time-major (all streams of step t before step t + 1), so
+the trace depends only on the seed: generate(N) and iter_blocks(N) agree for
+any block size.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+Param = Union[float, Tuple[float, float]]
+
+
+def _per_stream(value: Param, streams: int, rng: np.random.Generator) -> np.ndarray:
+    """(streams, 1) column so it broadcasts across the time axis."""
+    if isinstance(value, tuple):
+        lo, hi = value
+        return rng.uniform(lo, hi, size=(streams, 1))
+    return np.full((streams, 1), float(value))
+
+
+def _span(t: np.ndarray, start: int, stop: Optional[int] = None) -> slice:
+    """Columns of a block (t is a contiguous step range) with start <= t < stop."""
+    lo = int(np.searchsorted(t, start, side="left"))
+    hi = len(t) if stop is None else int(np.searchsorted(t, stop, side="left"))
+    return slice(lo, max(lo, hi))
+
+
+class Regime(ABC):
+    """One composable piece of a scenario; apply() edits `out` in place for steps `t`."""
+
+    def init(self, streams: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """Per-stream parameters, drawn once per generate()/iter_blocks() call."""
+        return {}
+
+    @abstractmethod
+    def apply(self, out: np.ndarray, t: np.ndarray, p: Dict[str, np.ndarray], rng: np.random.Generator) -> None:
+        ...
+
+
+@dataclass
+class Drift(Regime):
+    """Linear drift of `rate` per step between start and stop (held afterwards)."""
+    rate: Param = 0.001
+    start: int = 0
+    stop: Optional[int] = None
+
+    def init(self, streams, rng):
+        return {"rate": _per_stream(self.rate, streams, rng)}
+
+    def apply(self, out, t, p, rng):
+        end = t[-1] if self.stop is None else self.stop
+        elapsed = np.clip(np.minimum(t, end) - self.start, 0, None).astype(np.float64)
+        out += p["rate"] * elapsed
+
+
+@dataclass
+class Shift(Regime):
+    """From step `at` on: x -> x * scale + offset (a reality change)."""
+    at: int = 120
+    offset: Param = 1.0
+    scale: Param = 1.0
+
+    def init(self, streams, rng):
+        return {"offset": _per_stream(self.offset, streams, rng), "scale": _per_stream(self.scale, streams, rng)}
+
+    def apply(self, out, t, p, rng):
+        cols = _span(t, self.at)
+        block = out[:, cols]
+        block *= p["scale"]
+        block += p["offset"]
+
+
+@dataclass
+class Noise(Regime):
+    """Gaussian noise between start and stop (whole run by default)."""
+    std: Param = 0.05
+    start: int = 0
+    stop: Optional[int] = None
+
+    def init(self, streams, rng):
+        return {"std": _per_stream(self.std, streams, rng)}
+
+    def apply(self, out, t, p, rng):
+        cols = _span(t, self.start, self.stop)
+        k = cols.stop - cols.start
+        if k:
+            noise = rng.standard_normal((k, out.shape[0])).T  # time-major draws
+            noise *= p["std"]
+            out[:, cols] += noise
+
+
+@dataclass
+class NoiseBurst(Noise):
+    """Noise only inside [start, stop), e.g. the benchmarks' window 90..120 inclusive."""
+    std: Param = 1.0
+    start: int = 90
+    stop: Optional[int] = 121
+
+
+@dataclass
+class Periodic(Regime):
+    """amplitude * sin(2*pi*t / period + phase); phase random per stream if random_phase."""
+    period: Param = 62.83
+    amplitude: Param = 1.0
+    random_phase: bool = False
+
+    def init(self, streams, rng):
+        phase = rng.uniform(0.0, 2 * np.pi, size=(streams, 1)) if self.random_phase else np.zeros((streams, 1))
+        return {
+            "period": _per_stream(self.period, streams, rng),
+            "amplitude": _per_stream(self.amplitude, streams, rng),
+            "phase": phase,
+        }
+
+    def apply(self, out, t, p, rng):
+        wave = np.sin(2 * np.pi * t / p["period"] + p["phase"])
+        wave *= p["amplitude"]
+        out += wave
+
+
+@dataclass
+class RandomWalk(Regime):
+    """Cumulative Gaussian steps; the walk carries over between blocks."""
+    std: Param = 0.01
+
+    def init(self, streams, rng):
+        return {"std": _per_stream(self.std, streams, rng), "level": np.zeros((streams, 1))}
+
+    def apply(self, out, t, p, rng):
+        walk = rng.standard_normal(out.shape[::-1]).T  # time-major draws
+        walk *= p["std"]
+        walk[:, :1] += p["level"]  # carry in before summing: same rounding as one long cumsum
+        np.cumsum(walk, axis=1, out=walk)
+        p["level"] = walk[:, -1:].copy()
+        out += walk
+
+
+@dataclass
+class Scenario:
+    regimes: List[Regime] = field(default_factory=list)
+    base: Param = 0.0
+
+    def iter_blocks(
+        self,
+        steps: int,
+        streams: int = 1,
+        seed: int = 0,
+        block_steps: int = 1 << 16,
+        dtype=np.float64,
+    ) -> Iterator[np.ndarray]:
+        """Yield (streams, <=block_steps) arrays covering steps 1..steps in order."""
+        if steps < 0 or streams <= 0 or block_steps <= 0:
+            raise ValueError("need steps >= 0, streams > 0, block_steps > 0")
+        root = np.random.SeedSequence(seed)
+        param_seq, *regime_seqs = root.spawn(1 + len(self.regimes))
+        prng = np.random.default_rng(param_seq)
+        base = _per_stream(self.base, streams, prng)
+        params = [r.init(streams, prng) for r in self.regimes]
+        rngs = [np.random.default_rng(s) for s in regime_seqs]
+
+        for t0 in range(1, steps + 1, block_steps):
+            t = np.arange(t0, min(t0 + block_steps, steps + 1), dtype=np.int64)
+            out = np.repeat(base, len(t), axis=1)
+            for regime, p, rng in zip(self.regimes, params, rngs):
+                regime.apply(out, t, p, rng)
+            yield out.astype(dtype, copy=False)
+
+    def generate(self, steps: int, streams: int = 1, seed: int = 0, dtype=np.float64) -> np.ndarray:
+        """Whole trace as one (streams, steps) array, in a single vectorized block."""
+        if steps == 0:
+            return np.empty((streams, 0), dtype=dtype)
+        return next(self.iter_blocks(steps, streams, seed, block_steps=steps, dtype=dtype))
+
+
+# Scenarios used by benchmarks/run_benchmarks.py, as losses around a stable level.
+
+def stagnation(level: Param = 1.0, noise: Param = 0.001) -> Scenario:
+    return Scenario([Noise(std=noise)], base=level)
+
+
+def reality_shift(at: int = 120, offset: Param = 10.0, level: Param = 1.0, noise: Param = 0.001) -> Scenario:
+    return Scenario([Shift(at=at, offset=offset), Noise(std=noise)], base=level)
+
+
+def noise_window(start: int = 90, stop: int = 121, std: Param = 50.0, level: Param = 1.0) -> Scenario:
+    """Noise on steps start..stop-1; the default matches the benchmark's 90 <= step <= 120."""
+    return Scenario([NoiseBurst(std=std, start=start, stop=stop), Noise(std=0.001)], base=level)
+
+
+def sensor_world(shift_at: int = 120, shift_magnitude: float = 1.8, noise_std: float = 0.05) -> Scenario:
+    """Vectorized SimpleSensorWorld: sin(0.1 t) + noise, law changes at shift_at."""
+    return Scenario([
+        Periodic(period=2 * np.pi / 0.1),
+        Shift(at=shift_at, scale=shift_magnitude, offset=0.8),
+        Noise(std=noise_std),
+    ])
@@ -1,9 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from collections import defaultdict, Counter
+from collections import Counter, OrderedDict
 import math
 import re
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterator, Mapping, Optional, Sequence, Union
 
 def tokenize(text: str) -> List[str]:
     text = text.lower()
@@ -14,55 +14,339 @@ def tokenize(text: str) -> List[str]:
 class NGramConfig:
     n: int = 3
     add_k: float = 0.5  # smoothing
+    cache_size: int = 1 << 16  # max cached (context, next) log-probs; 0 disables
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0      # contexts dropped by LRU
+    invalidations: int = 0  # contexts dropped because update() changed their counts
+    clears: int = 0         # full flushes because the vocabulary size changed
+    maxsize: int = 0
+    currsize: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+class _Ranking:
+    """
+    Tokens of one context kept sorted by count (descending), so top-k is a slice.
+    Counts only ever grow by 1, so an increment swaps the token with the first
+    token of its old count block: O(1) per update. Ties are in no fixed order.
+    """
+    __slots__ = ("order", "pos", "head")
+
+    def __init__(self, counter: Counter):
+        self.order: List[str] = sorted(counter, key=counter.__getitem__, reverse=True)
+        self.pos: Dict[str, int] = {t: i for i, t in enumerate(self.order)}
+        self.head: Dict[int, int] = {}  # count -> first index holding that count
+        for i in range(len(self.order) - 1, -1, -1):
+            self.head[counter[self.order[i]]] = i
+
+    def bump(self, tok: str, counter: Counter) -> None:
+        """Call after counter[tok] was incremented by one."""
+        order, pos, head = self.order, self.pos, self.head
+        c = counter[tok] - 1
+        if c == 0:
+            order.append(tok)
+            pos[tok] = len(order) - 1
+            head.setdefault(1, len(order) - 1)
+            return
+        p = pos[tok]
+        h = head[c]
+        if p != h:
+            other = order[h]
+            order[h], order[p] = tok, other
+            pos[tok], pos[other] = h, p
+        if h + 1 < len(order) and counter[order[h + 1]] == c:
+            head[c] = h + 1
+        else:
+            del head[c]
+        head.setdefault(c + 1, h)
+
+class _ContextView(Mapping):
+    """
+    Read-only ctx tuple -> value view over one of the model's packed-key tables
+    (`counts` over the Counters, `context_totals` over the totals), so every
+    context is stored once, under its int key. Unseen contexts read as empty.
+    """
+    __slots__ = ("_lm", "_table", "_default")
+
+    def __init__(self, lm: "NGramLM", table: Dict[int, object], default):
+        self._lm = lm
+        self._table = table
+        self._default = default
+
+    def __getitem__(self, ctx: Tuple[str, ...]):
+        key = self._lm._key_of(ctx)
+        value = None if key is None else self._table.get(key)
+        return self._default() if value is None else value
+
+    def __contains__(self, ctx: object) -> bool:
+        key = self._lm._key_of(ctx) if isinstance(ctx, tuple) else None
+        return key is not None and key in self._table
+
+    def __iter__(self) -> Iterator[Tuple[str, ...]]:
+        ctx_of = self._lm._ctx_of
+        return (ctx_of(key) for key in self._table)
+
+    def __len__(self) -> int:
+        return len(self._table)
 
 class NGramLM:
     """
     N-gram language model with add-k smoothing.
     Provides negative log-likelihood loss over a chunk.
+
+    Per-pair -log(prob) values are kept in an LRU cache grouped by context:
+    update() drops the contexts it touched, and the whole cache is flushed
+    when the vocabulary size (the smoothing denominator) changes.
+
+    Scoring walks the tokens once with a rolling packed key of the last n-1
+    token ids (KEY_BITS bits per id, so keys never collide) instead of slicing
+    a context tuple per position. The count tables are keyed by that int:
+    `_by_key` holds each context's Counter and `_totals` its total. `counts`
+    and `context_totals` are read-only ctx-tuple views over them.
     """
+    KEY_BITS = 32
+
     def __init__(self, cfg: NGramConfig | None = None):
         self.cfg = cfg or NGramConfig()
-        self.counts: Dict[Tuple[str, ...], Counter] = defaultdict(Counter)
-        self.context_totals: Dict[Tuple[str, ...], int] = defaultdict(int)
         self.vocab: Counter = Counter()
 
-    def _contexts(self, tokens: List[str]) -> List[Tuple[Tuple[str, ...], str]]:
-        n = self.cfg.n
-        if len(tokens) < n:
-            return []
-        pairs = []
-        for i in range(n - 1, len(tokens)):
-            ctx = tuple(tokens[i - (n - 1): i])
-            nxt = tokens[i]
-            pairs.append((ctx, nxt))
-        return pairs
+        self._ids: Dict[str, int] = {}  # token -> id >= 1; 0 marks unseen tokens
+        self._tokens: List[str] = [""]  # id -> token
+        self._by_key: Dict[int, Counter] = {}
+        self._totals: Dict[int, int] = {}
+        self._key_mask = (1 << (self.KEY_BITS * (self.cfg.n - 1))) - 1
+
+        # per-context candidates sorted by count; built on first predict_next() call
+        self._rankings: Optional[Dict[int, _Ranking]] = None
+
+        self._cache: "OrderedDict[int, Dict[str, float]]" = OrderedDict()
+        self._cache_vocab_size = 0
+        self._cache_stats = CacheStats(maxsize=self.cfg.cache_size)
+
+        self.frozen = False
+
+    def freeze(self) -> "NGramLM":
+        """
+        Make the model read-only (update() raises) so it can be shared with worker
+        processes, see metatime.text.parallel. The LRU cache is cleared and then
+        bypassed, so scoring a frozen model writes nothing to it.
+        """
+        self.cache_clear()
+        self.frozen = True
+        return self
+
+    @property
+    def counts(self) -> Mapping[Tuple[str, ...], Counter]:
+        return _ContextView(self, self._by_key, Counter)
+
+    @property
+    def context_totals(self) -> Mapping[Tuple[str, ...], int]:
+        return _ContextView(self, self._totals, int)
+
+    def _ctx_of(self, key: int) -> Tuple[str, ...]:
+        bits, id_mask, tokens = self.KEY_BITS, (1 << self.KEY_BITS) - 1, self._tokens
+        return tuple(tokens[(key >> (bits * j)) & id_mask] for j in range(self.cfg.n - 2, -1, -1))
+
+    def _key_of(self, ctx: Tuple[str, ...]) -> Optional[int]:
+        """Packed key of an (n-1)-token context; None if it is shorter or has an unknown token."""
+        if len(ctx) != self.cfg.n - 1:
+            return None
+        key = 0
+        for t in ctx:
+            i = self._ids.get(t)
+            if i is None:
+                return None
+            key = (key << self.KEY_BITS) | i
+        return key
 
     def update(self, text: str) -> None:
+        if self.frozen:
+            raise RuntimeError("NGramLM is frozen (read-only); train a new model instead")
         toks = tokenize(text)
+        ids = self._ids
         for t in toks:
             self.vocab[t] += 1
-        for ctx, nxt in self._contexts(toks):
-            self.counts[ctx][nxt] += 1
-            self.context_totals[ctx] += 1
+            if t not in ids:
+                ids[t] = len(ids) + 1
+                self._tokens.append(t)
 
-    def nll_loss(self, text: str) -> float:
-        toks = tokenize(text)
-        pairs = self._contexts(toks)
-        if not pairs:
-            return 10.0  # conservative high loss for short chunks
+        n = self.cfg.n
+        bits, mask = self.KEY_BITS, self._key_mask
+        by_key, totals = self._by_key, self._totals
+        rankings = self._rankings
+        touched = set()
+        key = 0
+        for i, nxt in enumerate(toks):
+            if i >= n - 1:
+                counter = by_key.get(key)
+                if counter is None:
+                    counter = by_key[key] = Counter()
+                counter[nxt] += 1
+                totals[key] = totals.get(key, 0) + 1
+                touched.add(key)
+                if rankings is not None:
+                    r = rankings.get(key)
+                    if r is None:
+                        rankings[key] = _Ranking(counter)
+                    else:
+                        r.bump(nxt, counter)
+            key = ((key << bits) | ids[nxt]) & mask
+        self._invalidate(touched)
+
+    def _invalidate(self, keys) -> None:
+        if not self._cache:
+            return
+        st = self._cache_stats
+        if len(self.vocab) != self._cache_vocab_size:
+            self.cache_clear()
+            st.clears += 1
+            return
+        for key in keys:
+            row = self._cache.pop(key, None)
+            if row is not None:
+                st.currsize -= len(row)
+                st.invalidations += 1
 
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self._cache_stats.currsize = 0
+
+    def cache_info(self) -> CacheStats:
+        st = self._cache_stats
+        return CacheStats(**{f: getattr(st, f) for f in st.__dataclass_fields__})
+
+    def _iter_nll(self, toks: List[str]) -> Iterator[float]:
+        """-log(prob) of every scored position, in order, in a single pass."""
+        n = self.cfg.n
         V = max(1, len(self.vocab))
         add_k = self.cfg.add_k
+        denom_k = add_k * V
+        ids, by_key, totals = self._ids, self._by_key, self._totals
+        bits, mask = self.KEY_BITS, self._key_mask
+        maxsize = 0 if self.frozen else self.cfg.cache_size
+        log = math.log
+
+        cache = self._cache
+        st = self._cache_stats
+        if maxsize > 0 and self._cache_vocab_size != len(self.vocab):
+            if cache:
+                self.cache_clear()
+                st.clears += 1
+            self._cache_vocab_size = len(self.vocab)
+
+        key = 0
+        for i, nxt in enumerate(toks):
+            if i >= n - 1:
+                row = None
+                if maxsize > 0:
+                    row = cache.get(key)
+                    if row is None:
+                        row = cache[key] = {}
+                    else:
+                        cache.move_to_end(key)
+                        nll = row.get(nxt)
+                        if nll is not None:
+                            st.hits += 1
+                            yield nll
+                            key = ((key << bits) | ids.get(nxt, 0)) & mask
+                            continue
+                    st.misses += 1
+
+                counter = by_key.get(key)
+                if counter is None:
+                    ctx_total, nxt_count = 0, 0
+                else:
+                    ctx_total, nxt_count = totals[key], counter.get(nxt, 0)
+                prob = (nxt_count + add_k) / (ctx_total + denom_k)
+                prob = max(prob, 1e-12)
+                nll = -log(prob)
+
+                if row is not None:
+                    row[nxt] = nll
+                    st.currsize += 1
+                    while st.currsize > maxsize:
+                        _, old = cache.popitem(last=False)
+                        st.currsize -= len(old)
+                        st.evictions += 1
+                yield nll
+            key = ((key << bits) | ids.get(nxt, 0)) & mask
+
+    def nll_loss(self, text: str) -> float:
+        toks = tokenize(text)
+        if len(toks) < self.cfg.n:
+            return 10.0  # conservative high loss for short chunks
 
         total = 0.0
-        for ctx, nxt in pairs:
-            ctx_total = self.context_totals.get(ctx, 0)
-            nxt_count = self.counts.get(ctx, Counter()).get(nxt, 0)
-            prob = (nxt_count + add_k) / (ctx_total + add_k * V)
-            prob = max(prob, 1e-12)
-            total += -math.log(prob)
+        for nll in self._iter_nll(toks):
+            total += nll
+        return total / (len(toks) - self.cfg.n + 1)
 
-        return total / len(pairs)
+    def sliding_perplexity(self, text: str, window: int, stride: int = 1) -> List[float]:
+        """
+        Perplexity of every `window`-position span of the document (one value per
+        `stride` positions), from a single pass: each position is scored once with
+        the rolling context key and the window keeps a running NLL sum.
+        Returns [] if the document has fewer than `window` scored positions.
+        """
+        if window <= 0 or stride <= 0:
+            raise ValueError("window and stride must be > 0")
+        toks = tokenize(text)
+        ring = [0.0] * window
+        running = 0.0
+        out: List[float] = []
+        for j, nll in enumerate(self._iter_nll(toks)):
+            slot = j % window
+            running += nll - ring[slot]
+            ring[slot] = nll
+            if j >= window - 1 and (j - window + 1) % stride == 0:
+                out.append(math.exp(running / window))
+            if slot == window - 1:
+                running = math.fsum(ring)  # re-anchor: no drift on long documents
+        return out
 
     def perplexity(self, text: str) -> float:
         return math.exp(self.nll_loss(text))
+
+    def _as_context(self, context: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+        toks = tokenize(context) if isinstance(context, str) else list(context)
+        k = self.cfg.n - 1
+        return tuple(toks[len(toks) - k:]) if k > 0 else ()
+
+    def predict_next(self, context: Union[str, Sequence[str]], k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Top-k next tokens for a context (text, or a token sequence; only its last
+        n-1 tokens are used) with their smoothed probabilities. O(k) per call:
+        candidates are kept sorted by count and updated incrementally by update().
+        Unseen contexts return [].
+        """
+        return self.predict_next_batch([context], k)[0]
+
+    def predict_next_batch(
+        self,
+        contexts: Sequence[Union[str, Sequence[str]]],
+        k: int = 5,
+    ) -> List[List[Tuple[str, float]]]:
+        if self._rankings is None:
+            self._rankings = {key: _Ranking(c) for key, c in self._by_key.items() if c}
+
+        rankings = self._rankings
+        V = max(1, len(self.vocab))
+        add_k = self.cfg.add_k
+        out: List[List[Tuple[str, float]]] = []
+        for context in contexts:
+            key = self._key_of(self._as_context(context))
+            r = None if key is None else rankings.get(key)
+            if r is None:
+                out.append([])
+                continue
+            counter = self._by_key[key]
+            denom = self._totals[key] + add_k * V
+            out.append([(t, (counter[t] + add_k) / denom) for t in r.order[:k]])
+        return out
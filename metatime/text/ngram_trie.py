@@ -0,0 +1,148 @@
+from __future__ import annotations
+import math
+from typing import Dict, List, Optional, Tuple
+
+from .ngram_model import NGramConfig, tokenize
+
+# Trie node: [count, child_total, children]
+#   count       - occurrences of the n-gram spelled by the path to this node
+#   child_total - occurrences of this path as a context (sum of children counts)
+#   children    - {token: node}, None until the first child is added
+# Nodes at depth n (full-order n-grams) never have children, so they are stored
+# as a bare int count in their parent's dict instead of a node list.
+_COUNT, _TOTAL, _CHILDREN = 0, 1, 2
+
+
+class MultiOrderNGramLM:
+    """
+    Counts every order 1..cfg.n in one pass over the text, in a single prefix trie:
+    the node for (a, b) is shared by the bigram "a b" and by every longer n-gram
+    starting with it, so orders share storage instead of being separate models.
+
+    For each order k, nll_loss(text, order=k) is identical to
+    NGramLM(NGramConfig(n=k, add_k=cfg.add_k)) trained on the same texts.
+    """
+    def __init__(self, cfg: NGramConfig | None = None):
+        self.cfg = cfg or NGramConfig()
+        if self.cfg.n < 1:
+            raise ValueError("n must be >= 1")
+        self.root: List = [0, 0, None]
+
+    @property
+    def max_order(self) -> int:
+        return self.cfg.n
+
+    def vocab_size(self) -> int:
+        children = self.root[_CHILDREN]
+        return len(children) if children else 0
+
+    def update(self, text: str) -> None:
+        toks = tokenize(text)
+        n = self.cfg.n
+        L = len(toks)
+        leaf = n - 1
+        for j in range(L):
+            node = self.root
+            for d in range(min(n, L - j)):
+                tok = toks[j + d]
+                node[_TOTAL] += 1
+                children = node[_CHILDREN]
+                if children is None:
+                    children = node[_CHILDREN] = {}
+                if d == leaf:
+                    children[tok] = children.get(tok, 0) + 1
+                    break
+                child = children.get(tok)
+                if child is None:
+                    child = children[tok] = [0, 0, None]
+                child[_COUNT] += 1
+                node = child
+        self.root[_COUNT] += L
+
+    def _node(self, ngram: Tuple[str, ...]):
+        node = self.root
+        for tok in ngram:
+            if not isinstance(node, list) or not node[_CHILDREN]:
+                return None
+            node = node[_CHILDREN].get(tok)
+            if node is None:
+                return None
+        return node
+
+    def count(self, ngram: Tuple[str, ...]) -> int:
+        """Occurrences of `ngram` (any length up to max_order)."""
+        node = self._node(tuple(ngram))
+        if node is None:
+            return 0
+        return node if isinstance(node, int) else node[_COUNT]
+
+    def context_total(self, context: Tuple[str, ...]) -> int:
+        node = self._node(tuple(context))
+        return node[_TOTAL] if isinstance(node, list) else 0
+
+    def nll_losses(self, text: str, orders: Optional[List[int]] = None) -> Dict[int, float]:
+        """
+        Mean NLL for several orders (all by default) in one walk: every start
+        position descends the trie once, scoring order d+1 at depth d.
+        """
+        n = self.cfg.n
+        wanted = sorted(set(orders)) if orders is not None else list(range(1, n + 1))
+        if any(k < 1 or k > n for k in wanted):
+            raise ValueError(f"orders must be within 1..{n}")
+        top = wanted[-1] if wanted else 0
+        keep = [False] * (top + 1)
+        for k in wanted:
+            keep[k] = True
+
+        toks = tokenize(text)
+        L = len(toks)
+        V = max(1, self.vocab_size())
+        add_k = self.cfg.add_k
+        denom_k = add_k * V
+
+        totals = [0.0] * (top + 1)
+        pairs = [0] * (top + 1)
+        for j in range(L):
+            node: Optional[List] = self.root
+            for d in range(min(top, L - j)):
+                nxt = toks[j + d]
+                child = None
+                if node is not None and node[_CHILDREN]:
+                    child = node[_CHILDREN].get(nxt)
+                k = d + 1
+                if keep[k]:
+                    ctx_total = node[_TOTAL] if node is not None else 0
+                    if child is None:
+                        nxt_count = 0
+                    elif k == n:
+                        nxt_count = child
+                    else:
+                        nxt_count = child[_COUNT]
+                    prob = (nxt_count + add_k) / (ctx_total + denom_k)
+                    prob = max(prob, 1e-12)
+                    totals[k] += -math.log(prob)
+                    pairs[k] += 1
+                node = child
+
+        # same fallback as NGramLM for chunks shorter than the order
+        return {k: (totals[k] / pairs[k] if pairs[k] else 10.0) for k in wanted}
+
+    def nll_loss(self, text: str, order: Optional[int] = None) -> float:
+        k = self.cfg.n if order is None else order
+        return self.nll_losses(text, [k])[k]
+
+    def perplexity(self, text: str, order: Optional[int] = None) -> float:
+        return math.exp(self.nll_loss(text, order))
+
+    def perplexities(self, text: str) -> Dict[int, float]:
+        return {k: math.exp(v) for k, v in self.nll_losses(text).items()}
+
+    def num_nodes(self) -> int:
+        total = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            total += 1
+            if isinstance(node, list) and node[_CHILDREN]:
+                stack.extend(node[_CHILDREN].values())
+        return total
@@ -0,0 +1,93 @@
+from __future__ import annotations
+import gc
+import multiprocessing as mp
+import os
+import threading
+from typing import Iterable, Iterator, Optional
+
+from .ngram_model import NGramLM
+
+# The model a worker scores against, set in each worker by the pool initializer.
+# With the "fork" start method the initializer's arguments are inherited, not
+# pickled, so the model reaches children through copy-on-write pages. Elsewhere
+# (spawn: Windows/macOS) it is pickled once per worker, never per task.
+_MODEL: Optional[NGramLM] = None
+_METRICS = ("nll", "perplexity")
+
+# gc.freeze() is process-wide: overlapping score_documents() generators share
+# one freeze, lifted when the last of them finishes.
+_gc_lock = threading.Lock()
+_gc_users = 0
+
+
+def _init_worker(model: NGramLM) -> None:
+    global _MODEL
+    _MODEL = model
+
+
+def _gc_hold() -> None:
+    global _gc_users
+    with _gc_lock:
+        _gc_users += 1
+        gc.freeze()
+
+
+def _gc_release() -> None:
+    global _gc_users
+    with _gc_lock:
+        _gc_users -= 1
+        if _gc_users == 0:
+            gc.unfreeze()
+
+
+def _score(doc: str, metric: str) -> float:
+    if metric == "nll":
+        return _MODEL.nll_loss(doc)
+    return _MODEL.perplexity(doc)
+
+
+def _score_nll(doc: str) -> float:
+    return _score(doc, "nll")
+
+
+def _score_perplexity(doc: str) -> float:
+    return _score(doc, "perplexity")
+
+
+def score_documents(
+    lm: NGramLM,
+    docs: Iterable[str],
+    processes: Optional[int] = None,
+    chunksize: int = 64,
+    metric: str = "nll",
+) -> Iterator[float]:
+    """
+    Score documents against a frozen NGramLM on a process pool, yielding one
+    value per document in input order (imap with `chunksize` documents per task).
+
+    Only documents and floats cross process boundaries; the model is shared via
+    fork copy-on-write (gc.freeze() keeps the collector from touching, and so
+    copying, its pages) or sent once per worker where fork is unavailable.
+    """
+    if not lm.frozen:
+        raise ValueError("score_documents needs a frozen model: call lm.freeze() first")
+    if metric not in _METRICS:
+        raise ValueError(f"metric must be one of {_METRICS}")
+    processes = processes or os.cpu_count() or 1
+    fn = _score_nll if metric == "nll" else _score_perplexity
+
+    if processes == 1:
+        for doc in docs:
+            yield lm.nll_loss(doc) if metric == "nll" else lm.perplexity(doc)
+        return
+
+    use_fork = "fork" in mp.get_all_start_methods()
+    ctx = mp.get_context("fork" if use_fork else None)
+    if use_fork:
+        _gc_hold()
+    try:
+        with ctx.Pool(processes, initializer=_init_worker, initargs=(lm,)) as pool:
+            yield from pool.imap(fn, docs, chunksize)
+    finally:
+        if use_fork:
+            _gc_release()
@@ -0,0 +1,215 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+import hashlib
+import math
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+from .ngram_model import NGramConfig, NGramLM, tokenize
+
+_SEP = "\x1f"
+
+
+@dataclass
+class SketchConfig:
+    """
+    Fixed memory for SketchNGramLM: 2 * width * depth * 8 bytes of counters
+    plus vocab_bits / 8 bytes for the vocabulary-size estimate.
+
+    Count-min guarantee per sketch (N = total items added):
+      true <= estimate <= true + eps * N   with probability >= 1 - delta,
+      eps = e / width, delta = exp(-depth).
+    """
+    width: int = 1 << 18
+    depth: int = 4
+    vocab_bits: int = 1 << 20
+    conservative: bool = True  # conservative update: never raises a counter above min + c
+    seed: int = 0
+
+    @classmethod
+    def for_error(cls, eps: float, delta: float, **kw) -> "SketchConfig":
+        """Smallest width/depth giving the (eps, delta) bound above."""
+        return cls(width=math.ceil(math.e / eps), depth=math.ceil(math.log(1.0 / delta)), **kw)
+
+
+class CountMinSketch:
+    def __init__(self, width: int, depth: int, seed: int = 0, conservative: bool = True):
+        if width <= 0 or depth <= 0:
+            raise ValueError("width and depth must be > 0")
+        self.width = width
+        self.depth = depth
+        self.conservative = conservative
+        self.total = 0
+        self._salt = seed.to_bytes(8, "little", signed=True)
+        self._table = array("q", bytes(8 * width * depth))
+
+    def _cells(self, key: str) -> List[int]:
+        # one 128-bit hash split into two halves; row i uses h1 + i*h2 (double hashing)
+        d = hashlib.blake2b(key.encode("utf-8"), digest_size=16, salt=self._salt).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        w = self.width
+        return [i * w + (h1 + i * h2) % w for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> None:
+        t = self._table
+        cells = self._cells(key)
+        self.total += count
+        if self.conservative:
+            target = min(t[c] for c in cells) + count
+            for c in cells:
+                if t[c] < target:
+                    t[c] = target
+        else:
+            for c in cells:
+                t[c] += count
+
+    def estimate(self, key: str) -> int:
+        t = self._table
+        return min(t[c] for c in self._cells(key))
+
+    def error_bound(self) -> Tuple[float, float]:
+        """(additive error, failure probability) of estimate() right now."""
+        return math.e / self.width * self.total, math.exp(-self.depth)
+
+    def memory_bytes(self) -> int:
+        return self._table.itemsize * len(self._table)
+
+
+class LinearCounter:
+    """Distinct-count estimate from a fixed bitmap (linear counting)."""
+    def __init__(self, bits: int, seed: int = 0):
+        self.bits = bits
+        self._salt = seed.to_bytes(8, "little", signed=True)
+        self._map = bytearray((bits + 7) // 8)
+        self._zeros = bits
+
+    def add(self, key: str) -> None:
+        d = hashlib.blake2b(key.encode("utf-8"), digest_size=8, salt=self._salt).digest()
+        b = int.from_bytes(d, "little") % self.bits
+        byte, mask = b >> 3, 1 << (b & 7)
+        if not self._map[byte] & mask:
+            self._map[byte] |= mask
+            self._zeros -= 1
+
+    def estimate(self) -> int:
+        if self._zeros == 0:
+            return self.bits  # saturated: increase vocab_bits
+        return round(-self.bits * math.log(self._zeros / self.bits))
+
+    def memory_bytes(self) -> int:
+        return len(self._map)
+
+
+class SketchNGramLM:
+    """
+    Approximate NGramLM for unbounded corpora: n-gram counts and context totals
+    live in two count-min sketches, vocabulary size in a linear counter, so
+    memory is set by SketchConfig and does not grow with the corpus.
+
+    nll_loss uses the same add-k formula as NGramLM on the estimates. Counts are
+    only ever overestimated (by at most eps * N with probability 1 - delta, see
+    SketchConfig), so rare n-grams look more likely than they are; the n-gram
+    estimate is capped at its context estimate to keep probabilities <= 1.
+    """
+    def __init__(self, cfg: NGramConfig | None = None, sketch: SketchConfig | None = None):
+        self.cfg = cfg or NGramConfig()
+        self.sketch_cfg = sketch or SketchConfig()
+        sc = self.sketch_cfg
+        self.ngrams = CountMinSketch(sc.width, sc.depth, sc.seed, sc.conservative)
+        self.contexts = CountMinSketch(sc.width, sc.depth, sc.seed + 1, sc.conservative)
+        self.vocab = LinearCounter(sc.vocab_bits, sc.seed + 2)
+
+    def _pairs(self, toks: List[str]) -> Iterable[Tuple[str, str]]:
+        n = self.cfg.n
+        for i in range(n - 1, len(toks)):
+            ctx = _SEP.join(toks[i - (n - 1): i])
+            yield ctx, ctx + _SEP + toks[i]
+
+    def update(self, text: str) -> None:
+        toks = tokenize(text)
+        for t in toks:
+            self.vocab.add(t)
+        for ctx_key, ngram_key in self._pairs(toks):
+            self.ngrams.add(ngram_key)
+            self.contexts.add(ctx_key)
+
+    def nll_loss(self, text: str) -> float:
+        toks = tokenize(text)
+        if len(toks) < self.cfg.n:
+            return 10.0  # same fallback as NGramLM
+
+        V = max(1, self.vocab.estimate())
+        add_k = self.cfg.add_k
+        total = 0.0
+        pairs = 0
+        for ctx_key, ngram_key in self._pairs(toks):
+            ctx_total = self.contexts.estimate(ctx_key)
+            nxt_count = min(self.ngrams.estimate(ngram_key), ctx_total)
+            prob = (nxt_count + add_k) / (ctx_total + add_k * V)
+            prob = max(prob, 1e-12)
+            total += -math.log(prob)
+            pairs += 1
+        return total / pairs
+
+    def perplexity(self, text: str) -> float:
+        return math.exp(self.nll_loss(text))
+
+    def memory_bytes(self) -> int:
+        return self.ngrams.memory_bytes() + self.contexts.memory_bytes() + self.vocab.memory_bytes()
+
+    def error_bound(self) -> Dict[str, float]:
+        ng_err, delta = self.ngrams.error_bound()
+        ctx_err, _ = self.contexts.error_bound()
+        return {"ngram_count_error": ng_err, "context_total_error": ctx_err, "failure_prob": delta}
+
+
+def exact_memory_bytes(lm: NGramLM) -> int:
+    """
+    Rough deep size of an exact NGramLM: everything reachable from its instance
+    attributes (count tables, token ids, LRU cache, rankings), so new storage
+    added to NGramLM is counted without changes here. Shared objects count once.
+    """
+    seen = set()
+    total = 0
+    stack = [vars(lm)]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__slots__"):
+            stack.extend(getattr(obj, a) for a in obj.__slots__ if hasattr(obj, a))
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+    return total
+
+
+def accuracy_report(exact: NGramLM, approx: SketchNGramLM, texts: Iterable[str]) -> Dict[str, float]:
+    """
+    Compare a sketch model against an exact model trained on the same data:
+    NLL error on `texts` next to the memory each one uses.
+    """
+    errs = []
+    for text in texts:
+        errs.append(approx.nll_loss(text) - exact.nll_loss(text))
+    n = max(1, len(errs))
+    report = {
+        "texts": float(len(errs)),
+        "mean_abs_nll_error": sum(abs(e) for e in errs) / n,
+        "max_abs_nll_error": max((abs(e) for e in errs), default=0.0),
+        "mean_nll_bias": sum(errs) / n,
+        "exact_bytes": float(exact_memory_bytes(exact)),
+        "sketch_bytes": float(approx.memory_bytes()),
+        "exact_vocab": float(len(exact.vocab)),
+        "sketch_vocab": float(approx.vocab.estimate()),
+    }
+    report.update(approx.error_bound())
+    return report
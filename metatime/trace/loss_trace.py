@@ -0,0 +1,187 @@
+"""
+Loss-trace I/O for offline replay through RelationalClock.
+
+Layout on disk:
+  - a single `.npy` file (1-D float array, or a structured array with named fields)
+  - a raw little-endian float file (`.f32` / `.f64`, or any path + explicit dtype)
+  - a columnar directory produced by csv_to_columns(): one `<column>.npy` per column
+
+Everything is opened with mmap, so the trace is never loaded as a whole: only
+the block being replayed is read (tick_many() turns each block into a list).
+"""
+from __future__ import annotations
+
+import csv
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..core.clock import RelationalClock
+
+PathLike = Union[str, Path]
+
+COLUMNS_FILE = "columns.json"
+RAW_DTYPES = {".f32": "<f4", ".f64": "<f8"}
+
+
+def _count_rows(path: Path, chunk_size: int = 1 << 20) -> int:
+    rows = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            rows += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        rows += 1  # no trailing newline on the last row
+    return rows
+
+
+def csv_to_columns(
+    csv_path: PathLike,
+    out_dir: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    delimiter: str = ",",
+    dtype: str = "<f8",
+    chunk_rows: int = 1 << 16,
+) -> List[str]:
+    """
+    Convert a CSV log (first row = header) into a columnar directory.
+    Only the requested columns are kept (all of them by default).
+    Parsing happens once here; replay afterwards only touches the .npy files.
+    Empty cells become NaN.
+    """
+    csv_path = Path(csv_path)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    n_rows = _count_rows(csv_path) - 1  # minus header
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        first = next(reader, None)
+        if first is None:
+            raise ValueError(f"{csv_path}: CSV has no header row")
+        header = [h.strip() for h in first]
+        names = list(columns) if columns is not None else header
+        missing = [c for c in names if c not in header]
+        if missing:
+            raise KeyError(f"columns not in CSV header: {missing}")
+        idx = [header.index(c) for c in names]
+
+        arrays = [
+            np.lib.format.open_memmap(out / f"{c}.npy", mode="w+", dtype=dtype, shape=(max(0, n_rows),))
+            for c in names
+        ]
+
+        row = 0
+        buf: List[List[str]] = []
+        for rec in reader:
+            if not rec:
+                continue
+            buf.append([rec[i] if i < len(rec) else "" for i in idx])
+            if len(buf) >= chunk_rows:
+                row = _flush(buf, arrays, row)
+                buf = []
+        row = _flush(buf, arrays, row)
+
+    for a in arrays:
+        a.flush()
+    del arrays
+    if row != n_rows:
+        # blank lines were skipped: trim each column to the rows actually read
+        for c in names:
+            path, tmp = out / f"{c}.npy", out / f"{c}.npy.tmp"
+            data = np.load(path, mmap_mode="r")
+            with open(tmp, "wb") as f:
+                np.save(f, data[:row])  # streamed from the mmap, not copied into RAM first
+            del data
+            tmp.replace(path)
+
+    (out / COLUMNS_FILE).write_text(json.dumps({"columns": names, "rows": row, "dtype": dtype}), encoding="utf-8")
+    return names
+
+
+def _flush(buf: List[List[str]], arrays: List[np.ndarray], row: int) -> int:
+    if not buf:
+        return row
+    block = np.array([[v if v.strip() else "nan" for v in r] for r in buf], dtype=np.float64)
+    for j, a in enumerate(arrays):
+        a[row: row + len(buf)] = block[:, j]
+    return row + len(buf)
+
+
+def list_columns(path: PathLike) -> List[str]:
+    """Column names of a columnar directory or a structured .npy file."""
+    p = Path(path)
+    if p.is_dir():
+        return json.loads((p / COLUMNS_FILE).read_text(encoding="utf-8"))["columns"]
+    arr = np.load(p, mmap_mode="r")
+    return list(arr.dtype.names or [])
+
+
+def open_trace(
+    path: PathLike,
+    column: Optional[str] = None,
+    dtype: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Memory-map a loss trace as a read-only 1-D array.
+
+    - directory      -> `column` is required (unless it holds a single column)
+    - `.npy`         -> plain 1-D array, or structured array + `column`
+    - `.f32`/`.f64`  -> raw little-endian floats
+    - anything else  -> raw floats, `dtype` is required
+    """
+    p = Path(path)
+    if p.is_dir():
+        names = list_columns(p)
+        if column is None:
+            if len(names) != 1:
+                raise ValueError(f"trace has columns {names}; pick one with column=")
+            column = names[0]
+        if column not in names:
+            raise KeyError(f"unknown column {column!r}; available: {names}")
+        return np.load(p / f"{column}.npy", mmap_mode="r")
+
+    if p.suffix == ".npy":
+        arr = np.load(p, mmap_mode="r")
+        if arr.dtype.names:
+            if column is None:
+                raise ValueError(f"trace has columns {list(arr.dtype.names)}; pick one with column=")
+            return arr[column]  # field view, still backed by the mmap
+        if column is not None:
+            raise ValueError("column= given but trace is not multi-column")
+        return arr
+
+    raw_dtype = dtype or RAW_DTYPES.get(p.suffix)
+    if raw_dtype is None:
+        raise ValueError(f"cannot infer dtype for {p.name}; pass dtype='<f4' or '<f8'")
+    return np.memmap(p, dtype=raw_dtype, mode="r")
+
+
+def iter_blocks(trace: np.ndarray, block_size: int = 1 << 16, start: int = 0) -> Iterator[np.ndarray]:
+    """Yield consecutive fixed-size views of `trace` (last one may be shorter)."""
+    if block_size <= 0:
+        raise ValueError("block_size must be > 0")
+    for i in range(start, len(trace), block_size):
+        yield trace[i: i + block_size]
+
+
+def replay(
+    clock: RelationalClock,
+    trace: np.ndarray,
+    block_size: int = 1 << 16,
+) -> Counter:
+    """
+    Stream a trace through clock.tick_many() block by block.
+    Returns counts per TemporalState value ("LIVING", "STAGNANT", "AWAKENING").
+    """
+    counts: Counter = Counter()
+    for block in iter_blocks(trace, block_size):
+        counts.update(clock.tick_many(block))
+    return Counter({state.value: n for state, n in counts.items()})
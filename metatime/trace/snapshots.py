@@ -0,0 +1,193 @@
+"""
+Periodic clock snapshots stored next to a loss log, for random access into a run.
+
+A snapshot file is a flat array of fixed-size little-endian records
+(SNAPSHOT_DTYPE), one every `interval` steps, sorted by step. The step column is
+the index: finding the snapshot for step t is a binary search, and rebuilding
+the exact clock state at t replays at most interval - 1 losses from the log.
+
+    # during training (or offline with write_snapshots)
+    with SnapshotWriter("run.snap", clock, interval=1 << 16) as snaps:
+        for loss in losses:
+            snaps.tick(loss)
+
+    index = SnapshotIndex("run.snap")
+    clock = index.clock_at(3_217_554, open_trace("run.f64"))
+
+Config and interval go to `<path>.json` so the index can rebuild clocks on its own.
+Step t consumes trace[t - 1], i.e. the log must start at the clock's step 1.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..core.clock import CODE_STATES, STATE_CODES, ClockConfig, RelationalClock, TemporalState
+
+PathLike = Union[str, Path]
+
+SNAPSHOT_DTYPE = np.dtype([
+    ("step", "<i8"),
+    ("relational_age", "<f8"),
+    ("prev_loss", "<f8"),  # NaN when has_prev == 0
+    ("ema_delta", "<f8"),
+    ("coherence", "<f8"),
+    ("prev_coherence", "<f8"),
+    ("density", "<f8"),
+    ("has_prev", "u1"),
+    ("last_state", "i1"),  # STATE_CODES value, -1 before the first tick
+])
+
+
+def _meta_path(path: PathLike) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + ".json")
+
+
+def _to_record(clock: RelationalClock) -> np.ndarray:
+    rec = np.zeros(1, dtype=SNAPSHOT_DTYPE)
+    for key, value in clock.state_dict().items():
+        if key == "step_counter":
+            rec["step"] = value
+        elif key == "prev_loss":
+            rec["has_prev"] = value is not None
+            rec["prev_loss"] = np.nan if value is None else value
+        else:
+            rec[key] = value
+    rec["last_state"] = -1 if clock.last_state is None else STATE_CODES[clock.last_state]
+    return rec
+
+
+def _from_record(rec: np.void) -> Dict[str, Any]:
+    return {
+        "step_counter": int(rec["step"]),
+        "relational_age": float(rec["relational_age"]),
+        "prev_loss": float(rec["prev_loss"]) if rec["has_prev"] else None,
+        "ema_delta": float(rec["ema_delta"]),
+        "coherence": float(rec["coherence"]),
+        "prev_coherence": float(rec["prev_coherence"]),
+        "density": float(rec["density"]),
+    }
+
+
+class SnapshotWriter:
+    """
+    Wraps a clock and appends a snapshot whenever step_counter reaches a multiple
+    of `interval` (and one for the starting state). tick()/tick_many() behave
+    exactly like the clock's; tick_many() splits blocks at snapshot boundaries.
+    """
+
+    def __init__(self, path: PathLike, clock: RelationalClock, interval: int = 1 << 16):
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        self.path = Path(path)
+        self.clock = clock
+        self.interval = interval
+        meta = {"interval": interval, "config": asdict(clock.cfg)}
+        _meta_path(self.path).write_text(json.dumps(meta), encoding="utf-8")
+        self._f = open(self.path, "wb")
+        self.snapshot()
+
+    def snapshot(self) -> None:
+        self._f.write(_to_record(self.clock).tobytes())
+        self._f.flush()
+
+    def tick(self, loss_value: float) -> TemporalState:
+        state = self.clock.tick(loss_value)
+        if self.clock.step_counter % self.interval == 0:
+            self.snapshot()
+        return state
+
+    def tick_many(self, losses: Sequence[float]) -> List[TemporalState]:
+        if hasattr(losses, "tolist"):
+            losses = losses.tolist()
+        states: List[TemporalState] = []
+        i = 0
+        while i < len(losses):
+            room = self.interval - self.clock.step_counter % self.interval
+            states.extend(self.clock.tick_many(losses[i: i + room]))
+            i += room
+            if self.clock.step_counter % self.interval == 0:
+                self.snapshot()
+        return states
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_snapshots(
+    trace: np.ndarray,
+    path: PathLike,
+    cfg: Optional[ClockConfig] = None,
+    interval: int = 1 << 16,
+) -> int:
+    """Build the snapshot file for an existing loss log in one pass. Returns snapshot count."""
+    clock = RelationalClock(cfg if cfg is not None else ClockConfig())
+    with SnapshotWriter(path, clock, interval) as w:
+        for i in range(0, len(trace), interval):
+            w.tick_many(trace[i: i + interval])
+    return len(trace) // interval + 1
+
+
+class SnapshotIndex:
+    """Read side: locate the snapshot at or before a step and rebuild the clock from it."""
+
+    def __init__(self, path: PathLike, cfg: Optional[ClockConfig] = None):
+        self.path = Path(path)
+        meta_file = _meta_path(self.path)
+        meta = json.loads(meta_file.read_text(encoding="utf-8")) if meta_file.exists() else {}
+        self.interval: Optional[int] = meta.get("interval")
+        if cfg is None:
+            cfg = ClockConfig(**meta["config"]) if "config" in meta else ClockConfig()
+        self.cfg = cfg
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-map the file, e.g. after a live SnapshotWriter appended to it."""
+        n = self.path.stat().st_size // SNAPSHOT_DTYPE.itemsize
+        self.records = (
+            np.memmap(self.path, dtype=SNAPSHOT_DTYPE, mode="r", shape=(n,))
+            if n else np.empty(0, dtype=SNAPSHOT_DTYPE)
+        )
+        self.steps = self.records["step"]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def nearest(self, step: int) -> np.void:
+        """Latest snapshot with snapshot.step <= step."""
+        i = int(np.searchsorted(self.steps, step, side="right")) - 1
+        if i < 0:
+            raise KeyError(f"no snapshot at or before step {step}")
+        return self.records[i]
+
+    def clock_at(self, step: int, trace: np.ndarray) -> RelationalClock:
+        """A clock in exactly the state it had right after `step` (0 = before any tick)."""
+        if not 0 <= step <= len(trace):
+            raise IndexError(f"step {step} outside trace of {len(trace)} losses")
+        rec = self.nearest(step)
+        clock = RelationalClock(self.cfg)
+        clock.load_state_dict(_from_record(rec))
+        code = int(rec["last_state"])
+        clock.last_state = None if code < 0 else CODE_STATES[code]
+        clock.tick_many(trace[int(rec["step"]): step])
+        return clock
+
+    def state_at(self, step: int, trace: np.ndarray) -> Dict[str, Any]:
+        """state_dict() at `step` plus the dynamic threshold and state of that step."""
+        clock = self.clock_at(step, trace)
+        out = clock.state_dict()
+        out["threshold"] = clock.get_dynamic_threshold()
+        out["state"] = clock.last_state
+        return out